@@ -3,10 +3,40 @@
 Generate all possible ability score palettes based on ability scoring schema.
 """
 
+import functools
+import heapq
 import itertools
 import math
 from collections import Counter
-from typing import Iterable
+from typing import Callable, Collection, Iterable, Iterator
+
+from . import instrumentation
+from .augmentations import Bonuses, canonical, orbits, runs
+from .cache import digest, palette_cache
+
+
+@functools.cache
+def _numpy():
+	"""Import the optional numpy package on first use, as it takes longer to import than everything else here.
+
+	Returns:
+		the numpy module, or None when it is not installed
+	"""
+	try:
+		import numpy
+
+	except ImportError:  # the array backend is optional
+		return None
+
+	return numpy
+
+
+def __getattr__(name: str):
+	"""Resolve the `numpy` module attribute on first access (see `_numpy`)."""
+	if name == "numpy":
+		return _numpy()
+
+	raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def int_str(entry: int | Iterable[int], referrence: int | None = None):
@@ -24,6 +54,119 @@ def int_str(entry: int | Iterable[int], referrence: int | None = None):
 	return " ".join((f"{item if item else '':{width}}" for item in entry))
 
 
+def combinations(
+	schema: dict[int, int],
+	extent: int,
+	cutoff: int,
+	leading: int | None = None,
+	within: bool = False,
+) -> Iterator[tuple[int, ...]]:
+	"""Yield all score combinations of a schema whose cost sums exactly to the cutoff, or at most to it.
+
+	The combinations come out in the order of `itertools.combinations_with_replacement` over the schema,
+	but branches that cannot reach the cutoff are pruned while building instead of filtered afterwards.
+	A memoised feasibility table over (remaining slots, remaining budget, minimum score) guarantees
+	that every branch entered ends in at least one combination, so the work is proportional to the output.
+	While recording (see `instrumentation`), the scores tried at each position and the combinations yielded are counted.
+
+	Arguments:
+		schema: a dictionary with costs on scores
+		extent: number of scores in each combination
+		cutoff: the exact cost each combination must sum to, or the most it may sum to
+		leading: only yield combinations starting with this score, to shard the enumeration
+			default: yield all combinations
+		within: yield combinations costing at most the cutoff, leaving some residual cost unspent
+			default: yield combinations costing exactly the cutoff
+
+	Yields:
+		score combinations with the requested total cost
+	"""
+	scores = list(schema)
+	costs = [schema[score] for score in scores]
+	scanned = accepted = 0
+
+	@functools.cache
+	def feasible(slots: int, budget: int, start: int) -> bool:
+		if not slots:
+			return budget >= 0 if within else not budget
+
+		if start == len(scores):
+			return False
+
+		return feasible(slots - 1, budget - costs[start], start) or feasible(slots, budget, start + 1)
+
+	def expand(prefix: list[int], slots: int, budget: int, start: int) -> Iterator[tuple[int, ...]]:
+		nonlocal scanned, accepted
+
+		if not slots:
+			accepted += 1
+			yield tuple(prefix)
+			return
+
+		scanned += len(scores) - start
+
+		for index in range(start, len(scores)):
+			if feasible(slots - 1, budget - costs[index], index):
+				prefix.append(scores[index])
+				yield from expand(prefix, slots - 1, budget - costs[index], index)
+				prefix.pop()
+
+	try:
+		if leading is None:
+			if feasible(extent, cutoff, 0):
+				yield from expand([], extent, cutoff, 0)
+
+		elif extent and leading in schema:
+			index = scores.index(leading)
+			scanned += 1
+
+			if feasible(extent - 1, cutoff - costs[index], index):
+				yield from expand([leading], extent - 1, cutoff - costs[index], index)
+
+	finally:
+		if instrumentation.active is not None:
+			instrumentation.active.add("combinations.scanned", scanned)
+			instrumentation.active.add("combinations.accepted", accepted)
+
+
+def _combinations_shard(schema: dict[int, int], extent: int, cutoff: int, leading: int) -> set["Scores"]:
+	"""Evaluate the score palettes starting with a given score in a worker process (see `combinations`)."""
+	return set(Scores(scores) for scores in combinations(schema, extent, cutoff, leading=leading))
+
+
+_shared_bonuses: Callable[[tuple[int, ...]], Collection[tuple[int, ...]]] = lambda scores: ()
+
+
+def _share_augmentations(augmentations: frozenset[tuple[int, ...]]):
+	"""Hand the augmentations over to a worker process once instead of pickling them along with every chunk.
+
+	The worker keeps their canonical forms (see `augmentations.canonical`) for all the chunks it augments.
+	"""
+	global _shared_bonuses
+	_shared_bonuses = canonical(augmentations)
+
+
+def _augment_shard(palettes: list["Scores"]) -> tuple[set["Scores"], int]:
+	"""Augment a chunk of score palettes in a worker process (see `Abilities.augment`), counting the augmentations applied."""
+	bonuses = _shared_bonuses
+	shard = set()
+	applied = 0
+
+	for scores in palettes:
+		_bonuses = bonuses(scores)
+		applied += len(_bonuses)
+		shard.update(scores + augmentation for augmentation in _bonuses)
+
+	return shard, applied
+
+
+def _record(applied: int, kept: int):
+	"""Count the augmentations applied and the duplicates they collapsed into the palettes kept, while recording (see `instrumentation`)."""
+	if instrumentation.active is not None:
+		instrumentation.active.add("augmentations.applied", applied)
+		instrumentation.active.add("duplicates.collapsed", applied - kept)
+
+
 class Schema(dict[int, int]):
 	"""A Counter dictionary connecting a score to its cost.
 
@@ -100,26 +243,46 @@ class Schema(dict[int, int]):
 			)
 
 		return _str
+
 	def __add__(self, other: "Schema") -> "Schema":
 		"""Add two schemas by adding all combination of keys of sums between them.
 
+		The sum is a max-plus convolution of the two schemas as dense cost arrays indexed by score offset,
+		shifting the other array once per score of this schema and merging it element-wise.
+		Negative costs in the sum are clamped to zero.
+
 		Arguments:
 			other: another Schema
 
 		Returns:
 			sum of the two schemas
 		"""
-		_add = self.__class__()
+		if not self or not other:
+			return self.__class__()
+
+		self_ground, other_ground = min(self), min(other)
+		self_costs = [self.get(score, -math.inf) for score in range(self_ground, max(self) + 1)]
+		other_costs = [other.get(score, -math.inf) for score in range(other_ground, max(other) + 1)]
+		_costs = [-math.inf] * (len(self_costs) + len(other_costs) - 1)
 
-		for self_score, other_score in itertools.product(self, other):
-			_score = self_score + other_score
-			_add[_score] = max(_add.get(_score, 0), self[self_score] + other[other_score])
+		for offset, self_cost in enumerate(self_costs):
+			if self_cost != -math.inf:
+				_costs[offset:offset + len(other_costs)] = map(max,
+					_costs[offset:offset + len(other_costs)],
+					(self_cost + other_cost for other_cost in other_costs),
+				)
 
-		return _add
+		return self.__class__({
+			self_ground + other_ground + offset: max(int(cost), 0) for offset, cost in enumerate(_costs) if cost != -math.inf
+		})
 
 	def __mul__(self, times: int) -> "Schema":
 		"""Add a schema many times.
 
+		The schema is added to itself by repeated squaring, so only logarithmically many additions are needed.
+		Schemas with negative costs are added one at a time instead, like repeated `+` does,
+		since clamping each sum to zero makes the result depend on the order of additions.
+
 		Arguments:
 			times: how many times to add schema
 
@@ -127,9 +290,22 @@ class Schema(dict[int, int]):
 			the same schema added several times
 		"""
 		_mul = Schema()
+		_pow = self
+
+		if any(cost < 0 for cost in self.values()):
+			for _ in range(times):
+				_mul = _mul + self if _mul else self.__class__(self)
+
+			return _mul
 
-		for _ in range(times):
-			_mul += self
+		while times > 0:
+			if times & 1:
+				_mul = _mul + _pow if _mul else self.__class__(_pow)  # a fresh schema even when added once
+
+			times >>= 1
+
+			if times:
+				_pow = _pow + _pow
 
 		return _mul
 
@@ -222,6 +398,127 @@ class Scores(tuple[int]):
 		return list(Counter(distribution)[count + 1] for count in range(len(self)))
 
 
+def augmented(palettes: Iterable[Scores], augmentations: set[tuple[int, ...]]) -> Iterator[Scores]:
+	"""Lazily augment a sorted stream of score palettes, yielding the results deduplicated and sorted.
+
+	Adding a non-negative augmentation never sorts a palette below itself,
+	so any pending result smaller than the next incoming palette is final and can be yielded right away.
+	Only the window of results between consecutive incoming palettes is kept in memory.
+	Streams with negative augmentations fall back to sorting the full result.
+	Each palette is only added the augmentations giving distinct results on it (see `augmentations.orbits`).
+
+	Arguments:
+		palettes: score palettes in ascending order
+		augmentations: score palettes to add to each palette (see `Abilities.augment`)
+
+	Yields:
+		all augmented score palettes in ascending order without duplicates
+	"""
+	bonuses = canonical(frozenset(augmentations))
+
+	if any(bonus < 0 for augmentation in augmentations for bonus in augmentation):
+		_augmented = set()
+		applied = 0
+
+		for scores in palettes:
+			_bonuses = bonuses(scores)
+			applied += len(_bonuses)
+			_augmented.update(scores + augmentation for augmentation in _bonuses)
+
+		_record(applied, len(_augmented))
+		yield from sorted(_augmented)
+		return
+
+	pending: list[Scores] = []
+	queued: set[Scores] = set()
+	applied = kept = 0
+
+	for scores in palettes:
+		while pending and pending[0] < scores:
+			queued.remove(pending[0])
+			kept += 1
+			yield heapq.heappop(pending)
+
+		_bonuses = bonuses(scores)
+		applied += len(_bonuses)
+
+		for augmentation in _bonuses:
+			_scores = scores + augmentation
+
+			if _scores not in queued:
+				queued.add(_scores)
+				heapq.heappush(pending, _scores)
+
+	kept += len(pending)
+	_record(applied, kept)
+
+	while pending:
+		yield heapq.heappop(pending)
+
+
+def render(palettes: Iterable[Scores], spectrum: Iterable[int], mod: int = 1) -> Iterator[str]:
+	"""Print score palettes with their statistics line by line, exactly like `Scores.__repr__`.
+
+	Column widths and padded cells are computed once per distinct value and reused for the whole set,
+	statistics are computed once per palette from a single count of its scores,
+	and the type, pattern and distribution columns are formatted once per distinct distribution.
+	Palettes whose maximum score is outside the spectrum are skipped, like in `Abilities.__repr__`.
+
+	Arguments:
+		palettes: score palettes to print
+		spectrum: possible scores for the distribution, in the order they are printed
+		mod: base of multiples scores are checked against
+
+	Yields:
+		one line per palette with scores, sum, mod, type, pattern and distribution
+	"""
+	spectrum = list(spectrum)
+	inside = set(spectrum)
+	widths: dict[int, int] = {}
+	cells: dict[tuple[int, int], str] = {}
+	statistics: dict[tuple[int, ...], str] = {}
+
+	def width(total: int) -> int:
+		if total not in widths:
+			widths[total] = int(math.log10(total)) + 1 if total else 1
+
+		return widths[total]
+
+	def cell(item: int, _width: int) -> str:
+		if (item, _width) not in cells:
+			cells[item, _width] = f"{item if item else '':{_width}}"
+
+		return cells[item, _width]
+
+	for scores in palettes:
+		if max(scores) not in inside:
+			continue
+
+		total = sum(scores)
+		counts = Counter(scores)
+		distribution = tuple(counts[score] for score in spectrum)
+
+		if distribution not in statistics:
+			pattern = Counter(distribution)
+			pattern = [pattern[count + 1] for count in range(len(scores))]
+			pattern_width = width(sum(pattern))
+			distribution_width = width(sum(distribution))
+			statistics[distribution] = (
+				f" type {cell(sum(pattern), width(sum(pattern)))}"
+				f" pattern {' '.join(cell(count, pattern_width) for count in pattern)}"
+				f" distribution {' '.join(cell(count, distribution_width) for count in distribution)}"
+			)
+
+		scores_width = width(total)
+		modded = sum(1 for score in scores if score % mod == 0)
+
+		yield (
+			f" scores {' '.join(cell(score, scores_width) for score in scores)}"
+			f" sum {cell(total, scores_width)}"
+			f" mod {cell(modded, width(modded))}"
+			f"{statistics[distribution]}"
+		)
+
 
 class Abilities(set):
 	"""Expands an attribute score schema to all possible attribute score palettes.
@@ -231,17 +528,53 @@ class Abilities(set):
 		_schema: dict with costs of scores
 		_extent: number of attributes in ability score system
 		_cutoff: a custom cutoff for the cost of viable score palettes
+		_lazy: whether palettes are streamed on demand instead of stored in the set
+		_stages: augmentations pending on the palette stream in lazy mode
+		_stage_keys: the cache key of the palettes after each pending augmentation
+		_backend: the engine augmenting stored palettes, either "python" or "numpy"
+		_workers: number of processes sharing the evaluation of stored palettes
+		_cache: whether palettes are looked up in and stored to the palette cache
+		_key: digest of the game class, schema, extent, cutoff and augmentations defining the palettes
+		_residual: whether palettes costing less than the cutoff are kept too
+		_residuals: the palettes of each residual cost left unspent in residual mode
 
 	Methods:
 		fit: evaluate the scores in an attributes system
+		residual: the palettes leaving a given residual cost unspent
+		iter_palettes: stream all score palettes in ascending order
+		lines: stream the printed score palettes line by line
+		export: write all score palettes with their statistics to a file
+		index: index all score palettes for filtering by their statistics
+		top: find the best scoring palettes
 
 	Operators:
 		__repr__: print all available score palettes given cutoff
 	"""
 
-	def __init__(self, schema: Schema, extent: int, cutoff: int | None = None):
+	_spectrum: set[int] | None = None  # scores printed in distributions, the scores in the schema by default
+	_mod = 1  # base of multiples counted when printing
+
+	_backends = {"python", "numpy"}
+	_array_size = 1 << 24  # maximum number of array cells broadcast at once by the numpy backend
+
+	def __init__(self,
+		schema: Schema,
+		extent: int,
+		cutoff: int | None = None,
+		lazy: bool = False,
+		backend: str = "python",
+		workers: int = 1,
+		cache: bool = False,
+		residual: bool = False,
+	):
 		"""Abilities constructor.
 
+		In lazy mode the set itself stays empty and augmentations are only recorded as pipeline stages.
+		Palettes are then generated on every call of `iter_palettes` without ever being materialised.
+
+		In residual mode palettes costing at most the cutoff are all found in a single enumeration,
+		and kept grouped by the residual cost they leave unspent, each group available through `residual`.
+
 		Arguments:
 			schema: a dictionary with costs on scores
 				default: create an empty score system
@@ -249,9 +582,37 @@ class Abilities(set):
 				default: create an empty score system
 			cutoff: a custom cutoff for the cost of viable score palettes
 				default: half the maximum cost defined by the schema
+			lazy: stream score palettes on demand instead of storing them
+				default: evaluate and store all score palettes
+			backend: the engine augmenting stored palettes, "numpy" requiring the optional numpy package
+				default: plain python score palette addition
+			workers: number of processes to shard the enumeration by leading score and the augmentation by chunks,
+				the numpy backend augments in a single process
+				default: evaluate everything in the current process
+			cache: look palettes up in the palette cache before evaluating them and store them there after
+				default: always evaluate palettes
+			residual: keep palettes costing less than the cutoff too, grouped by residual cost, neither lazy nor cached
+				default: keep palettes costing exactly the cutoff
 		"""
+		if backend not in Abilities._backends:
+			raise ValueError(f"unknown backend {backend!r}, choose one of {sorted(Abilities._backends)}")
+
+		if residual and (lazy or cache):
+			raise ValueError("residual mode keeps palettes grouped in memory, so it can neither be lazy nor cached")
+
+		if backend == "numpy" and _numpy() is None:
+			raise ImportError("the numpy backend requires numpy to be installed")
+
 		self._schema = schema
 		self._extent = extent
+		self._lazy = lazy
+		self._backend = backend
+		self._workers = workers
+		self._cache = cache
+		self._stages: list[set[tuple[int, ...]]] = []
+		self._stage_keys: list[str] = []
+		self._residual = residual
+		self._residuals: dict[int, Abilities] = {}
 
 		if cutoff:
 			self._cutoff = cutoff
@@ -259,33 +620,369 @@ class Abilities(set):
 		else:
 			self._cutoff = (self._extent * max(self._schema.values())) // 2  # default cost cutoff for viable score palettes
 
+		self._key = self._base_key()
+
 		super().__init__()
 
-		for scores in itertools.combinations_with_replacement(self._schema, self._extent):
-			if sum(self._schema[score] for score in scores) == self._cutoff:  # NOTE: check case with residual cost
-				self.add(Scores(scores))
+		if self._lazy or self._cached():
+			return
 
-	def augment(self, augmentations: set[int]):
+		if self._residual:
+			groups: dict[int, list[Scores]] = {}
+
+			for scores in combinations(self._schema, self._extent, self._cutoff, within=True):
+				groups.setdefault(self._cutoff - sum(self._schema[score] for score in scores), []).append(Scores(scores))
+
+			self._residuals = {residual: self._group(residual, palettes) for residual, palettes in sorted(groups.items())}
+			self.update(*self._residuals.values())
+
+		elif self._workers > 1:
+			from concurrent.futures import ProcessPoolExecutor  # only sharded evaluation needs process pools
+
+			with ProcessPoolExecutor(self._workers) as executor:
+				for shard in executor.map(_combinations_shard,
+					itertools.repeat(self._schema),
+					itertools.repeat(self._extent),
+					itertools.repeat(self._cutoff),
+					self._schema,
+				):
+					self.update(shard)
+
+		else:
+			self.update(Scores(scores) for scores in combinations(self._schema, self._extent, self._cutoff))
+
+		if self._cache:
+			palette_cache.put(self._key, self)
+
+	def _base_key(self) -> str:
+		"""Get the cache key of the score palettes before any augmentation."""
+		return digest(type(self).__name__, sorted(self._schema.items()), self._extent, self._cutoff)
+
+	def _cached(self) -> bool:
+		"""Replace stored palettes with the cached ones under the current key if caching and any are found.
+
+		Returns:
+			whether cached palettes were found
+		"""
+		if not self._cache:
+			return False
+
+		palettes = palette_cache.get(self._key)
+
+		if palettes is None:
+			return False
+
+		self.clear()
+		self.update(map(Scores, palettes))
+
+		return True
+
+	def augment(self, augmentations: set[int], key: str | None = None):
 		"""Evaluate the scores in an attributes system with an optional augmentation score palette.
 
+		Each palette is only added the augmentations giving distinct results on it (see `augmentations.orbits`).
+
 		Example:
 			When selecting a race and subrace in D&D one gets usually a +2 and a +1 anywhere in their score palette.
 
 		Arguments:
 			augmentations: a score palette containing the ne augmentation to mixin (see example)
+			key: the cache key of the augmented palettes, for augmentations that reach a known result another way
+				default: derived from the current key and the definition of the augmentations (see `augmentations.definition`),
+				or all of them when they have none
 
 		Returns:
 			a set of all viable (augmented or not) scores
 		"""
-		_augmented = set()
+		self._key = key or digest(self._key, augmentations.definition if isinstance(augmentations, Bonuses) else sorted(augmentations))
 
-		while self:
-			scores = self.pop()
-			_augmented.update(scores + augmentation for augmentation in augmentations)
+		if self._lazy:
+			self._stages.append(augmentations)
+			self._stage_keys.append(self._key)
+			return
 
-		self.update(_augmented)
+		if self._residual:
+			self._residuals = {residual: group._derive(augmentations) for residual, group in self._residuals.items()}
+			self.clear()
+			self.update(*self._residuals.values())
+			return
 
-	def __repr__(self, spectrum: set[int] | None = None, mod: int = 1) -> str:
+		if self._cached():
+			return
+
+		augmentations = frozenset(augmentations)
+
+		if self._backend == "numpy":
+			self._augment_array(augmentations)
+
+		elif self._workers > 1:
+			self._augment_shards(augmentations)
+
+		else:
+			_augmented = set()
+			bonuses = canonical(augmentations)
+			applied = 0
+
+			while self:
+				scores = self.pop()
+				_bonuses = bonuses(scores)
+				applied += len(_bonuses)
+				_augmented.update(scores + augmentation for augmentation in _bonuses)
+
+			_record(applied, len(_augmented))
+			self.update(_augmented)
+
+		if self._cache:
+			palette_cache.put(self._key, self)
+
+	def _group(self, residual: int, palettes: Iterable[Scores]) -> "Abilities":
+		"""Make the palettes of a residual cost a regular attribute score system like this one, in place if they are one."""
+		if isinstance(palettes, Abilities):
+			group = palettes
+
+		else:
+			group = type(self).__new__(type(self))
+			set.update(group, palettes)
+
+		group.__dict__.update(self.__dict__, _residual=False, _residuals={}, _key=digest(self._key, "residual", residual))
+
+		return group
+
+	def residual(self, residual: int = 0) -> "Abilities":
+		"""Get the palettes leaving a residual cost unspent, evaluated along all others in residual mode.
+
+		The group is kept as is and only takes on the current attributes of this one,
+		so getting it costs nothing, and it is to be treated as read-only.
+
+		Arguments:
+			residual: the cost left unspent out of the cutoff
+				default: palettes spending exactly the cutoff
+
+		Returns:
+			the palettes leaving the residual cost unspent, as a regular attribute score system
+		"""
+		if not self._residual:
+			raise ValueError("only attribute score systems in residual mode keep palettes costing less than the cutoff")
+
+		return self._group(residual, self._residuals.get(residual, ()))
+
+	def _derive(self, augmentations: set[tuple[int, ...]], key: str | None = None) -> "Abilities":
+		"""Copy the attribute score system with its palettes augmented once more, leaving this one intact.
+
+		Arguments:
+			augmentations: a score palette containing the ne augmentation to mixin (see `augment`)
+			key: the cache key of the augmented palettes (see `augment`)
+
+		Returns:
+			the augmented copy
+		"""
+		derived = type(self).__new__(type(self))
+		derived.__dict__.update(self.__dict__)
+		derived._stages = list(self._stages)
+		derived._stage_keys = list(self._stage_keys)
+		set.update(derived, self)
+		derived.augment(augmentations, key=key)
+
+		return derived
+
+	def _augment_shards(self, augmentations: frozenset[tuple[int, ...]]):
+		"""Augment stored score palettes in chunks shared among worker processes and unite the results.
+
+		Arguments:
+			augmentations: a score palette containing the ne augmentation to mixin (see `augment`)
+		"""
+		from concurrent.futures import ProcessPoolExecutor  # only sharded evaluation needs process pools
+
+		palettes = list(self)
+		size = max(1, -(-len(palettes) // (self._workers * 4)))  # a few chunks per worker to balance the load
+
+		self.clear()
+
+		with ProcessPoolExecutor(self._workers, initializer=_share_augmentations, initargs=(augmentations,)) as executor:
+			applied = 0
+
+			for shard, _applied in executor.map(_augment_shard, (palettes[start:start + size] for start in range(0, len(palettes), size))):
+				self.update(shard)
+				applied += _applied
+
+		_record(applied, len(self))
+
+	def _augment_array(self, augmentations: frozenset[tuple[int, ...]]):
+		"""Augment stored score palettes as a broadcasted integer matrix addition.
+
+		Palettes are grouped by the lengths of their runs of equal scores (see `augmentations.orbits`),
+		so that each group forms an (N, extent) matrix and its canonical augmentations an (M, extent) one.
+		Their broadcasted (N, M, extent) sum is sorted along the score axis and deduplicated row-wise,
+		in chunks of palettes small enough to keep the broadcast within `_array_size` cells.
+		Rows are deduplicated as single radix-packed integers when they fit in 63 bits,
+		which is much faster than `numpy.unique(axis=0)` on the rows themselves.
+
+		Arguments:
+			augmentations: a score palette containing the ne augmentation to mixin (see `augment`)
+		"""
+		if not self or not augmentations:
+			self.clear()
+			return
+
+		numpy = _numpy()
+		groups: dict[tuple[int, ...], list[Scores]] = {}
+
+		for scores in self:
+			groups.setdefault(runs(scores), []).append(scores)
+
+		ground = min(map(min, self)) + min(map(min, augmentations))
+		radix = max(map(max, self)) + max(map(max, augmentations)) - ground + 1
+		packed = radix ** self._extent < 1 << 63
+		powers = radix ** numpy.arange(self._extent - 1, -1, -1, dtype=numpy.int64)
+
+		chunks = []
+		applied = 0
+
+		for _runs, _palettes in groups.items():
+			palettes = numpy.array(_palettes, dtype=numpy.int64).reshape(-1, self._extent)
+			bonuses = numpy.array(
+				list(orbits(augmentations, _runs) if len(_palettes) >= 4 and len(_runs) < self._extent else augmentations),
+				dtype=numpy.int64,
+			).reshape(-1, self._extent)
+			rows = max(1, Abilities._array_size // (len(bonuses) * self._extent))
+			applied += len(palettes) * len(bonuses)
+
+			for start in range(0, len(palettes), rows):
+				_augmented = (palettes[start:start + rows, None, :] + bonuses[None, :, :]).reshape(-1, self._extent)
+				_augmented.sort(axis=1)
+				chunks.append(numpy.unique((_augmented - ground) @ powers) if packed else numpy.unique(_augmented, axis=0))
+
+		_augmented = numpy.unique(numpy.concatenate(chunks), axis=None if packed else 0)
+
+		if packed:
+			_augmented = _augmented[:, None] // powers % radix + ground
+
+		self.clear()
+		self.update(map(Scores, _augmented.tolist()))
+		_record(applied, len(self))
+
+	def iter_palettes(self) -> Iterator[Scores]:
+		"""Stream all score palettes in ascending order without duplicates.
+
+		In lazy mode the palettes are enumerated from the schema and pass through each augmentation stage,
+		so the whole result never resides in memory, unless it is to be cached once fully streamed.
+		When caching, they start from the palettes of the latest stage found cached instead,
+		like those of the attribute score system this one was derived from by an increment.
+
+		Yields:
+			all viable (augmented or not) scores in ascending order
+		"""
+		if not self._lazy:
+			yield from sorted(self)
+			return
+
+		palettes: Iterable[Scores] | None = None
+		stage = 0
+
+		if self._cache:
+			for stage, key in reversed(list(enumerate([self._base_key(), *self._stage_keys]))):
+				cached = palette_cache.get(key)
+
+				if cached is not None:
+					palettes = map(Scores, cached)
+					break
+
+			if palettes is not None and stage == len(self._stages):
+				yield from palettes
+				return
+
+		if palettes is None:
+			stage = 0
+			palettes = (Scores(scores) for scores in combinations(dict(sorted(self._schema.items())), self._extent, self._cutoff))
+
+		for augmentations in self._stages[stage:]:
+			palettes = augmented(palettes, augmentations)
+
+		if not self._cache:
+			yield from palettes
+			return
+
+		streamed = []
+
+		for scores in palettes:
+			streamed.append(scores)
+			yield scores
+
+		palette_cache.put(self._key, streamed)
+
+	def lines(self, spectrum: set[int] | None = None, mod: int | None = None) -> Iterator[str]:
+		"""Stream the printed score palettes line by line (see `render`).
+
+		Arguments:
+			spectrum: a set of possible scores for the distribution
+				default: the spectrum of the attribute score system, or else the scores in the schema
+			mod: base of multiples scores are checked against
+				default: the mod of the attribute score system
+
+		Yields:
+			one line per score palette with a maximum score in the spectrum
+		"""
+		if spectrum is None:
+			spectrum = self._spectrum if self._spectrum is not None else set(self._schema)
+
+		yield from render(self.iter_palettes(), spectrum, self._mod if mod is None else mod)
+
+	def export(self, path: str, spectrum: set[int] | None = None, mod: int | None = None):
+		"""Write all score palettes with their statistics to a `.npy`, `.npz`, `.csv` or `.jsonl` file (see `export.export`).
+
+		Arguments:
+			path: the file to write, its extension choosing the format
+			spectrum: a set of possible scores for the distribution
+				default: the spectrum of the attribute score system, or else the scores in the schema
+			mod: base of multiples scores are checked against
+				default: the mod of the attribute score system
+		"""
+		from .export import export  # the export module builds on this one
+
+		export(self, path, spectrum, mod)
+
+	def index(self, spectrum: set[int] | None = None, mod: int | None = None):
+		"""Index all score palettes for filtering by their statistics (see `query.Index`).
+
+		Arguments:
+			spectrum: a set of possible scores for the distribution
+				default: the spectrum of the attribute score system, or else the scores in the schema
+			mod: base of multiples scores are checked against
+				default: the mod of the attribute score system
+
+		Returns:
+			an index to select palettes from by constraints
+		"""
+		from .query import Index  # the query module builds on this one
+
+		return Index(self, spectrum, mod)
+
+	def top(
+		self,
+		score: Callable[[Scores], float],
+		k: int = 10,
+		monotone: bool = False,
+		bound: Callable[[tuple[int, ...], int, int], float] | None = None,
+	) -> list[tuple[float, Scores]]:
+		"""Find the best scoring palettes, searching lazy ones by branch and bound without enumerating them (see `search.top`).
+
+		Arguments:
+			score: the function to maximise over palettes
+			k: how many palettes to find
+				default: 10
+			monotone: whether the function never decreases when a score increases, allowing to prune branches by it
+				default: make no assumption about the function
+			bound: an upper bound on the score of any palette a branch can still reach (see `search.top`)
+				default: bound branches only for monotone functions
+
+		Returns:
+			up to k pairs of a score and a palette, best first
+		"""
+		from .search import top  # the search module builds on this one
+
+		return top(self, score, k, monotone, bound)
+
+	def __repr__(self, spectrum: set[int] | None = None, mod: int | None = None) -> str:
 		"""Print a score palette along with its various statistics.
 
 		Statistics:
@@ -293,9 +990,6 @@ class Abilities(set):
 			pattern: counting of the distribution values
 			type: counting of the pattern values showing how many distinct values are in score palette
 		"""
-		if spectrum is None:
-			spectrum = set(self._schema)
-
 	#   _str=f"\n extent {self._extent}\n cutoff {self._cutoff}\n {self._schema}\n"
 	#   _str=""
 
@@ -303,4 +997,4 @@ class Abilities(set):
 	#       if max(scores) in spectrum:
 	#           _str+="\n"+scores.__repr__(spectrum,mod)
 
-		return "\n".join(scores.__repr__(spectrum, mod) for scores in sorted(self) if max(scores) in spectrum)
+		return "\n".join(self.lines(spectrum, mod))
@@ -0,0 +1,196 @@
+"""Augmentation index.
+
+Memoised sets of distinct bonus vectors to augment score palettes with (see `Abilities.augment`),
+built lazily on first use and shared by every game and configuration asking for them again.
+Spreads and their sums grow to hundreds of thousands of vectors, so only the most recently used ones are kept.
+Each set knows the fixed bonuses and points it is made of (see `definition`),
+so that augmented palettes are keyed by these instead of by all the vectors.
+"""
+
+import functools
+import itertools
+from collections import Counter
+from typing import Callable, Collection, Iterable
+
+
+def definition(bonuses: Iterable[tuple[int, ...]] = (), points: int = 0) -> tuple[tuple[tuple[int, ...], ...], int]:
+	"""Name the bonus vectors arranging fixed bonuses and spreading points anywhere, without building them.
+
+	Example:
+		A D&D Hill Dwarf with 2 extra ability points is (((0, 0, 0, 0, 1, 2),), 2).
+
+	Arguments:
+		bonuses: fixed bonuses each going anywhere, like a race bonus
+			default: no fixed bonus
+		points: number of points to spread anywhere
+			default: 0
+
+	Returns:
+		the fixed bonuses other than none, each in ascending order and all in ascending order, along with the points
+	"""
+	return tuple(sorted(tuple(sorted(bonus)) for bonus in bonuses if any(bonus))), points
+
+
+class Bonuses(frozenset[tuple[int, ...]]):
+	"""A set of distinct bonus vectors along with the definition it is built from (see `definition`).
+
+	Attributes:
+		definition: the fixed bonuses and points the vectors arrange and spread
+	"""
+
+	__slots__ = ("definition",)
+
+	def __new__(cls, vectors: Iterable[tuple[int, ...]], definition: tuple[tuple[tuple[int, ...], ...], int]):
+		"""Build a set of bonus vectors and record its definition."""
+		bonuses = super().__new__(cls, vectors)
+		bonuses.definition = definition
+
+		return bonuses
+
+	def __reduce__(self):
+		"""Pickle the definition along with the vectors, to hand them over to worker processes."""
+		return Bonuses, (frozenset(self), self.definition)
+
+
+@functools.cache
+def permutations(bonus: tuple[int, ...], extent: int) -> frozenset[tuple[int, ...]]:
+	"""Get all distinct arrangements of a bonus over the attributes.
+
+	Example:
+		A D&D Hill Dwarf gets (0, 0, 2, 0, 1, 0) that is a +2 and a +1 on any two different abilities.
+
+	Arguments:
+		bonus: the bonus on each attribute in any order
+		extent: number of attributes in ability score system
+
+	Returns:
+		all distinct bonus vectors with the same bonuses
+	"""
+	return Bonuses(itertools.permutations(bonus, extent), definition([bonus]))
+
+
+@functools.lru_cache(maxsize=16)
+def spreads(points: int, extent: int) -> frozenset[tuple[int, ...]]:
+	"""Get all ways to spread points over the attributes.
+
+	Example:
+		Extra D&D ability points from levelling up, or Cyberpunk attribute points, go anywhere one by one.
+
+	Arguments:
+		points: number of points to spread
+		extent: number of attributes in ability score system
+
+	Returns:
+		all non-negative bonus vectors summing to points, no bonus at all for no points
+	"""
+	if not extent:
+		return Bonuses({()} if not points else (), definition(points=points))
+
+	return Bonuses(
+		(
+			tuple(upper - lower - 1 for lower, upper in zip((-1,) + bars, bars + (points + extent - 1,)))
+			for bars in itertools.combinations(range(points + extent - 1), extent - 1)
+		),
+		definition(points=points),
+	)
+
+
+@functools.lru_cache(maxsize=16)
+def sums(
+	first: frozenset[tuple[int, ...]],
+	other: frozenset[tuple[int, ...]],
+) -> frozenset[tuple[int, ...]]:
+	"""Combine two sets of bonus vectors into one of their element-wise sums.
+
+	Augmenting with the combined set once is the same as augmenting with the first set and then the other,
+	as long as the other set contains all arrangements of its bonuses, like those from `permutations` and `spreads`.
+
+	Arguments:
+		first: bonus vectors applied first
+		other: bonus vectors applied next, closed under permutation
+
+	Returns:
+		all distinct sums of a bonus vector from each set, defined by both definitions together when both sets have one
+	"""
+	vectors = (
+		tuple(first_bonus + other_bonus for first_bonus, other_bonus in zip(first_bonuses, other_bonuses))
+		for first_bonuses, other_bonuses in itertools.product(first, other)
+	)
+
+	if isinstance(first, Bonuses) and isinstance(other, Bonuses):
+		return Bonuses(vectors, definition(first.definition[0] + other.definition[0], first.definition[1] + other.definition[1]))
+
+	return frozenset(vectors)
+
+
+def orbits(augmentations: frozenset[tuple[int, ...]], runs: tuple[int, ...]) -> tuple[tuple[int, ...], ...]:
+	"""Get one bonus vector from each orbit of the bonus vectors under rearrangements within runs of equal scores.
+
+	Rearranging a bonus vector within a run of equal scores of a palette gives the same augmented palette,
+	so the canonical form of each orbit, sorted within each run, is all that needs adding to the palette.
+	Palettes sharing the lengths of their runs of equal scores share their canonical bonus vectors.
+
+	Example:
+		On (8, 8, 8, 13, 15, 15) with runs (3, 1, 2) a Hill Dwarf bonus yields 9 canonical forms instead of 30.
+
+	Arguments:
+		augmentations: bonus vectors to add to a palette
+		runs: lengths of the consecutive runs of equal scores of the palette
+
+	Returns:
+		the distinct canonical bonus vectors
+	"""
+	bounds = list(itertools.accumulate(runs, initial=0))
+
+	return tuple({
+		tuple(bonus for lower, upper in zip(bounds, bounds[1:]) for bonus in sorted(augmentation[lower:upper]))
+		for augmentation in augmentations
+	})
+
+
+def runs(scores: tuple[int, ...]) -> tuple[int, ...]:
+	"""Get the lengths of the consecutive runs of equal scores of a palette (see `orbits`)."""
+	return tuple(len(list(run)) for _, run in itertools.groupby(scores))
+
+
+def canonical(
+	augmentations: frozenset[tuple[int, ...]],
+	threshold: int = 4,
+) -> Callable[[tuple[int, ...]], Collection[tuple[int, ...]]]:
+	"""Get the bonus vectors to add to each palette of a stream, canonical ones where they pay off (see `orbits`).
+
+	Canonical forms cost a pass over all bonus vectors for each new length of runs of equal scores,
+	so they are only built once as many palettes with these lengths have come as the threshold,
+	and never for palettes with distinct scores, whose canonical forms are all the bonus vectors.
+	They are kept along with the returned function only, and go with it once the stream is augmented.
+
+	Arguments:
+		augmentations: bonus vectors to add to each palette
+		threshold: palettes with the same lengths of runs to see before building their canonical bonus vectors
+			default: 4
+
+	Returns:
+		a function from a palette to the bonus vectors giving all its distinct augmented palettes
+	"""
+	seen: Counter[tuple[int, ...]] = Counter()
+	_orbits: dict[tuple[int, ...], tuple[tuple[int, ...], ...]] = {}
+
+	def bonuses(scores: tuple[int, ...]) -> Collection[tuple[int, ...]]:
+		_runs = runs(scores)
+
+		if _runs in _orbits:
+			return _orbits[_runs]
+
+		if len(_runs) == len(scores):
+			return augmentations
+
+		seen[_runs] += 1
+
+		if seen[_runs] < threshold:
+			return augmentations
+
+		_orbits[_runs] = orbits(augmentations, _runs)
+
+		return _orbits[_runs]
+
+	return bonuses
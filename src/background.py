@@ -0,0 +1,165 @@
+"""Background score palette generation.
+
+Generate and list score palettes in a background thread, so that menus stay responsive meanwhile,
+and let the likely next selections be generated speculatively before they are picked:
+
+	background = Background()
+	job = background.submit(("DungeonsDragons", 2, None, None, 3), lambda: DungeonsDragons(2, extra=3))
+	background.submit(("DungeonsDragons", 2, None, None, 4), lambda: DungeonsDragons(2, extra=4))  # prefetch
+	background.wait(job, lambda job: print(job.status()))
+
+Jobs run one at a time in submission order, so a job may build on the result of one submitted before it.
+The thread is a daemon, so quitting never waits for speculative generation.
+"""
+
+import queue
+import threading
+from typing import TYPE_CHECKING, Callable, Hashable
+
+if TYPE_CHECKING:  # the menu imports this module before any game, so it stays light
+	from .abilities import Abilities
+	from .view import View
+
+
+class Job:
+	"""Score palettes being generated in the background.
+
+	Attributes:
+		abilities: the attribute score system, once built
+		view: the score palettes listed for printing, growing while the job runs
+		error: the exception the generation failed with, if any
+		started: set when the generation has started
+		done: set when the generation has finished, successfully or not
+		cancelled: whether the job is to be skipped if it has not started yet
+	"""
+
+	def __init__(self, build: Callable[[], "Abilities"]):
+		"""Prepare a job.
+
+		Arguments:
+			build: construct the attribute score system to list
+		"""
+		self._build = build
+
+		self.abilities: "Abilities | None" = None
+		self.view: "View | None" = None
+		self.error: BaseException | None = None
+		self.started = threading.Event()
+		self.done = threading.Event()
+		self.cancelled = False
+
+	def run(self):
+		"""Build the attribute score system and list its score palettes one by one."""
+		from .view import View
+
+		self.started.set()
+
+		try:
+			self.abilities = self._build()
+			self.view = View(self.abilities)
+			self.view.load()
+
+		except Exception as error:  # reported to whoever waits for the job
+			self.error = error
+
+		finally:
+			self.done.set()
+
+	def status(self) -> str:
+		"""Describe the progress of the job in one line."""
+		palettes = len(self.view) if self.view is not None else 0
+
+		if self.done.is_set():
+			return f"failed: {self.error}" if self.error is not None else f"{palettes} palettes"
+
+		if self.started.is_set():
+			return f"generating... {palettes} palettes so far"
+
+		return "queued"
+
+
+class Background:
+	"""A background thread generating score palettes job by job, keeping finished jobs by key.
+
+	Attributes:
+		_jobs: jobs submitted, by key
+		_queue: jobs waiting to run
+		_thread: the worker thread
+	"""
+
+	def __init__(self):
+		"""Start the worker thread."""
+		self._jobs: dict[Hashable, Job] = {}
+		self._queue: queue.SimpleQueue[Job] = queue.SimpleQueue()
+		self._thread = threading.Thread(target=self._work, name="palettes", daemon=True)
+		self._thread.start()
+
+	def _work(self):
+		"""Run queued jobs forever, skipping cancelled ones."""
+		while True:
+			job = self._queue.get()
+
+			if not job.cancelled:
+				job.run()
+
+	def submit(self, key: Hashable, build: Callable[[], "Abilities"]) -> Job:
+		"""Queue the generation of score palettes, unless it was already submitted under the same key.
+
+		Arguments:
+			key: what identifies the score palettes, like the game name and arguments
+			build: construct the attribute score system to list
+
+		Returns:
+			the job generating the score palettes
+		"""
+		if key not in self._jobs or self._jobs[key].cancelled:
+			self._jobs[key] = Job(build)
+			self._queue.put(self._jobs[key])
+
+		return self._jobs[key]
+
+	def get(self, key: Hashable) -> Job | None:
+		"""Get the job submitted under a key, if any."""
+		return self._jobs.get(key)
+
+	def clear(self):
+		"""Cancel jobs that have not started yet and forget all jobs, as when the set-up changes."""
+		for job in self._jobs.values():
+			job.cancelled = True
+
+		self._jobs.clear()
+
+	def retain(self, keys: set[Hashable]):
+		"""Cancel jobs that have not started yet and forget jobs, except those under the given keys.
+
+		Arguments:
+			keys: the keys of the jobs to keep, like the current selection and its neighbours
+		"""
+		for key in set(self._jobs) - keys:
+			self._jobs.pop(key).cancelled = True
+
+	@staticmethod
+	def wait(job: Job, progress: Callable[[Job], None] | None = None, interval: float = .1) -> "View":
+		"""Wait for a job to finish, reporting its progress meanwhile.
+
+		Arguments:
+			job: the job to wait for
+			progress: called with the job periodically while it runs
+				default: report nothing
+			interval: seconds between progress reports
+				default: a tenth of a second
+
+		Returns:
+			the score palettes listed for printing
+
+		Raises:
+			the exception the generation failed with
+		"""
+		while not job.done.wait(interval):
+			if progress is not None:
+				progress(job)
+
+		if job.error is not None:
+			raise job.error
+
+		return job.view  # type: ignore
@@ -0,0 +1,230 @@
+"""Headless bulk generation of score palettes.
+
+Generate the score palettes of every requested game configuration in one process, without any menu,
+and stream them printed to standard output or to one file per configuration.
+
+Configurations of the same game set-up are generated in ascending order of extra points or levels,
+each derived from the previous one by a single-point augmentation, and all share the palette cache.
+
+Usage:
+	python -m src.batch --game DungeonsDragons --tier 2 --race all --extra 0-14 --output palettes
+	python -m src.batch --game Cyberpunk2077 --level 1-10 --format npy --output palettes
+"""
+
+import argparse
+import os
+import sys
+from typing import Iterator
+
+from .abilities import Abilities
+from .export import formats
+from .games.cyberpunk_2077 import Cyberpunk2077
+from .games.disco_elysium import DiscoElysium
+from .games.dungeons_and_dragons import DungeonsDragons
+
+
+def ranges(text: str) -> list[int]:
+	"""Parse a comma-separated list of integers and inclusive integer ranges, like "0-4,7".
+
+	Raises:
+		argparse.ArgumentTypeError: when a range is reversed, like "3-1", rather than silently empty
+	"""
+	values = []
+
+	for part in text.split(","):
+		first, _, last = part.partition("-")
+		first, last = int(first), int(last or first)
+
+		if first > last:
+			raise argparse.ArgumentTypeError(f"reversed range {part!r}, write it as {last}-{first}")
+
+		values.extend(range(first, last + 1))
+
+	return values
+
+
+def configurations(
+	games: list[str],
+	tiers: list[int],
+	races: list[str],
+	extras: list[int],
+	levels: list[int],
+	subraces: list[str] = ["all"],
+) -> list[dict]:
+	"""List game configurations.
+
+	Arguments:
+		games: game class names
+		tiers: D&D tiers
+		races: D&D races, "none" for no race, or "all" for all races and no race
+		extras: D&D extra ability points
+		levels: Cyberpunk levels
+		subraces: D&D subraces of the races that have any, or "all" for all of them
+			default: all subraces
+
+	Returns:
+		a dictionary of arguments for each configuration, along with the game name
+	"""
+	_configurations = []
+
+	if "DungeonsDragons" in games:
+		_races: list[tuple[str | None, str | None]] = []
+
+		for race in DungeonsDragons._races if "all" in races else races:
+			if race == "none":
+				_races.append((None, None))
+
+			elif isinstance(DungeonsDragons._races[race], dict):
+				_races.extend(
+					(race, subrace) for subrace in DungeonsDragons._races[race]  # type: ignore
+					if "all" in subraces or subrace in subraces
+				)
+
+			else:
+				_races.append((race, None))
+
+		if "all" in races:
+			_races.insert(0, (None, None))
+
+		for tier in tiers:
+			for race, subrace in _races:
+				for extra in extras:
+					_configurations.append(
+						{"game": "DungeonsDragons", "tier": tier, "race": race, "subrace": subrace, "extra": extra})
+
+	if "Cyberpunk2077" in games:
+		_configurations.extend({"game": "Cyberpunk2077", "level": level} for level in levels)
+
+	if "DiscoElysium" in games:
+		_configurations.append({"game": "DiscoElysium"})
+
+	return _configurations
+
+
+def generate(configurations: list[dict], cache: bool = True, **options) -> Iterator[tuple[dict, Abilities]]:
+	"""Generate the score palettes of each configuration, sharing work between consecutive ones.
+
+	A configuration with one more extra point or level than the previous one of the same set-up
+	is derived from it by a single-point augmentation (see `DungeonsDragons.increment`).
+
+	Arguments:
+		configurations: game names and arguments (see `configurations`)
+		cache: look palettes up in the palette cache and store them there, sharing base palettes between set-ups
+			default: use the palette cache
+		options: further arguments of all attribute score systems, like backend or workers
+
+	Yields:
+		each configuration along with its attribute score system
+	"""
+	previous: dict | None = None
+	abilities: Abilities | None = None
+
+	for configuration in configurations:
+		arguments = {key: value for key, value in configuration.items() if key != "game"}
+
+		if configuration["game"] == "DungeonsDragons":
+			if (
+				previous is not None and abilities is not None
+				and {**previous, "extra": configuration["extra"]} == configuration
+				and configuration["extra"] == abilities._extra + 1  # type: ignore
+			):
+				abilities = abilities.increment()  # type: ignore
+
+			else:
+				abilities = DungeonsDragons(**arguments, cache=cache, **options)
+
+		elif configuration["game"] == "Cyberpunk2077":
+			if (
+				previous is not None and abilities is not None and previous["game"] == "Cyberpunk2077"
+				and configuration["level"] == abilities._level + 1  # type: ignore
+			):
+				abilities = abilities.increment()  # type: ignore
+
+			else:
+				abilities = Cyberpunk2077(**arguments, cache=cache, **options)
+
+		else:
+			abilities = DiscoElysium(cache=cache, **options)
+
+		previous = configuration
+
+		yield configuration, abilities
+
+
+def _name(configuration: dict) -> str:
+	"""Name a configuration for a file name."""
+	return "_".join(f"{value}" for value in configuration.values() if value is not None)
+
+
+def write(configurations: list[dict], output: str | None = None, format: str = "txt", cache: bool = True, **options):
+	"""Generate the score palettes of each configuration and write them out as soon as each is ready.
+
+	Arguments:
+		configurations: game names and arguments (see `configurations`)
+		output: a directory to write one file per configuration to
+			default: print to standard output, each configuration under a commented header line
+		format: "txt" for printed palettes, or an export format (see `export.formats`) requiring an output directory
+			default: printed palettes
+		cache: use the palette cache (see `generate`)
+			default: use the palette cache
+		options: further arguments of all attribute score systems, like backend or workers
+	"""
+	if output is not None:
+		os.makedirs(output, exist_ok=True)
+
+	for configuration, abilities in generate(configurations, cache, **options):
+		if format != "txt":
+			abilities.export(os.path.join(output, f"{_name(configuration)}.{format}"))  # type: ignore
+
+		elif output is not None:
+			with open(os.path.join(output, f"{_name(configuration)}.txt"), "w") as file:
+				file.writelines(f"{line}\n" for line in abilities.lines())
+
+		else:
+			sys.stdout.write(f"# {' '.join(f'{key} {value}' for key, value in configuration.items() if value is not None)}\n")
+			sys.stdout.writelines(f"{line}\n" for line in abilities.lines())
+			sys.stdout.flush()
+
+
+if __name__ == "__main__":
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument("--game", nargs="+", default=["DungeonsDragons", "Cyberpunk2077", "DiscoElysium"],
+		choices=["DungeonsDragons", "Cyberpunk2077", "DiscoElysium"])
+	parser.add_argument("--tier", type=ranges, default=[2], help=f"D&D tiers, like 2 or 0-6: {DungeonsDragons._names}")
+	parser.add_argument("--race", nargs="+", default=["none"], choices=["all", "none", *DungeonsDragons._races])
+	parser.add_argument("--subrace", nargs="+", default=["all"], help="D&D subraces of the races chosen, or all")
+	parser.add_argument("--extra", type=ranges, default=[0], help="D&D extra ability points, like 0-14")
+	parser.add_argument("--level", type=ranges, default=[1], help="Cyberpunk levels, like 1-50")
+	parser.add_argument("--output", help="directory to write one file per configuration to, instead of standard output")
+	parser.add_argument("--format", default="txt", choices=["txt", *sorted(extension[1:] for extension in formats)])
+	parser.add_argument("--backend", default="python", choices=sorted(Abilities._backends))
+	parser.add_argument("--workers", type=int, default=1)
+	parser.add_argument("--no-cache", action="store_true", help="evaluate everything without the palette cache")
+	arguments = parser.parse_args()
+
+	if arguments.format != "txt" and arguments.output is None:
+		parser.error(f"the {arguments.format} format requires an output directory")
+
+	if "DungeonsDragons" in arguments.game and "all" not in arguments.subrace:
+		known = {subrace for subraces in DungeonsDragons._races.values() if isinstance(subraces, dict) for subrace in subraces}
+
+		for subrace in arguments.subrace:
+			if subrace not in known:
+				parser.error(f"unknown subrace {subrace!r}, choose from {sorted(known)} or all")
+
+		for race in arguments.race:  # races picked by name need one of their subraces picked, unlike all races
+			if isinstance(DungeonsDragons._races.get(race), dict) and not set(arguments.subrace) & set(DungeonsDragons._races[race]):  # type: ignore
+				parser.error(f"no subrace of {race} in {arguments.subrace}, choose from {list(DungeonsDragons._races[race])}")  # type: ignore
+
+	try:
+		write(
+			configurations(arguments.game, arguments.tier, arguments.race, arguments.extra, arguments.level, arguments.subrace),
+			arguments.output,
+			arguments.format,
+			cache=not arguments.no_cache,
+			backend=arguments.backend,
+			workers=arguments.workers,
+		)
+
+	except BrokenPipeError:  # piped into a reader that stopped early, like head
+		sys.stderr.close()
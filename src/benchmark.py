@@ -0,0 +1,255 @@
+"""Benchmark suite for all known game configurations.
+
+Time and memory-profile the construction, augmentation and printing of score palettes
+for every requested game configuration and engine, and save or compare machine-readable baselines.
+
+Usage:
+	python -m src.benchmark --games DungeonsDragons --tiers 2 --extras 0-4 --engines python numpy --save baseline.json
+	python -m src.benchmark --games DungeonsDragons --tiers 2 --extras 0-4 --engines python numpy --compare baseline.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import resource
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable
+
+from . import augmentations
+from .abilities import Abilities, _numpy
+from .batch import configurations, ranges
+from .games.cyberpunk_2077 import Cyberpunk2077
+from .games.disco_elysium import DiscoElysium
+from .games.dungeons_and_dragons import DungeonsDragons
+from .packed import PackedAbilities
+
+engines: dict[str, dict] = {
+	"python": {},
+	"lazy": {"lazy": True},
+	"numpy": {"backend": "numpy"},
+	"workers": {"workers": os.cpu_count() or 1},
+	"packed": {"lazy": True},  # streamed into a packed palette array
+}
+
+
+def _label(configuration: dict) -> str:
+	"""Name a configuration in one short line."""
+	return " ".join(f"{value}" for value in configuration.values() if value is not None)
+
+
+def _phases(configuration: dict, engine: str) -> tuple[Callable[[], Abilities], frozenset[tuple[int, ...]] | None]:
+	"""Split a configuration into its base construction and its augmentations.
+
+	Arguments:
+		configuration: game name and arguments (see `configurations`)
+		engine: the name of the engine options to construct with (see `engines`)
+
+	Returns:
+		a callable constructing the unaugmented palettes and the augmentations to apply on them, if any
+	"""
+	options = engines[engine]
+
+	if configuration["game"] == "DungeonsDragons":
+		race, subrace, extra = configuration["race"], configuration["subrace"], configuration["extra"]
+
+		return (
+			lambda: DungeonsDragons(configuration["tier"], **options),
+			DungeonsDragons.augmentations(race, subrace, extra) if race or extra else None,
+		)
+
+	if configuration["game"] == "Cyberpunk2077":
+		level = configuration["level"]
+
+		return (
+			lambda: Cyberpunk2077(**options),
+			augmentations.spreads(level - 1, Cyberpunk2077._extent) if level > 1 else None,
+		)
+
+	return lambda: DiscoElysium(**options), None
+
+
+def _run(configuration: dict, engine: str) -> tuple[dict[str, float], int, Abilities]:
+	"""Construct, augment and print the palettes of a configuration once.
+
+	Augmentation sets are built before timing starts, as they are memoised for the whole process anyway.
+
+	Arguments:
+		configuration: game name and arguments (see `configurations`)
+		engine: the name of the engine options to construct with (see `engines`)
+
+	Returns:
+		wall time in seconds for each phase, the number of palettes and the attribute score system itself
+	"""
+	construct, _augmentations = _phases(configuration, engine)
+	timings = {}
+
+	start = time.perf_counter()
+	abilities = PackedAbilities(construct()) if engine == "packed" else construct()
+	timings["construct"] = time.perf_counter() - start
+
+	start = time.perf_counter()
+
+	if _augmentations is not None:
+		abilities.augment(_augmentations)
+
+	timings["augment"] = time.perf_counter() - start
+
+	start = time.perf_counter()
+	repr(abilities)
+	timings["repr"] = time.perf_counter() - start
+
+	palettes = len(abilities) if engine != "lazy" else sum(1 for _ in abilities.iter_palettes())
+
+	return timings, palettes, abilities
+
+
+def measure(configuration: dict, engine: str) -> dict:
+	"""Benchmark a configuration with an engine.
+
+	A first run measures wall time and peak resident memory, a second one traces python allocations,
+	counting the memory blocks allocated by the run and still held once its palettes are built.
+
+	Arguments:
+		configuration: game name and arguments (see `configurations`)
+		engine: the name of the engine options to construct with (see `engines`)
+
+	Returns:
+		a record of the configuration, engine, palette count, phase timings and memory statistics
+	"""
+	timings, palettes = _run(configuration, engine)[:2]
+	peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss  # KiB on Linux
+
+	tracemalloc.start()
+	before = tracemalloc.take_snapshot()
+	_, _, abilities = _run(configuration, engine)
+	_, peak_traced = tracemalloc.get_traced_memory()
+	blocks = sum(stat.count_diff for stat in tracemalloc.take_snapshot().compare_to(before, "filename"))
+	tracemalloc.stop()
+	del abilities
+
+	return {
+		"configuration": configuration,
+		"engine": engine,
+		"palettes": palettes,
+		"seconds": timings | {"total": sum(timings.values())},
+		"peak_rss_kib": peak_rss,
+		"peak_traced_bytes": peak_traced,
+		"bytes_per_palette": peak_traced / palettes if palettes else 0.0,
+		"blocks_per_palette": blocks / palettes if palettes else 0.0,
+	}
+
+
+def run(configurations: list[dict], engines: list[str], isolate: bool = True) -> list[dict]:
+	"""Benchmark every configuration with every engine side by side.
+
+	Arguments:
+		configurations: game names and arguments (see `configurations`)
+		engines: names of the engine options to construct with (see `engines`)
+		isolate: measure each configuration in a freshly spawned process, so that peak resident memory is its own
+			default: isolate measurements
+
+	Returns:
+		a record for each configuration and engine (see `measure`)
+	"""
+	records = []
+
+	for configuration in configurations:
+		for engine in engines:
+			if isolate:
+				with ProcessPoolExecutor(1, mp_context=multiprocessing.get_context("spawn")) as executor:
+					record = executor.submit(measure, configuration, engine).result()
+
+			else:
+				record = measure(configuration, engine)
+
+			print(
+				f" {_label(configuration):32}"
+				f" {engine:8}"
+				f" palettes {record['palettes']:8}"
+				f" construct {record['seconds']['construct'] * 1000:9.1f} ms"
+				f" augment {record['seconds']['augment'] * 1000:9.1f} ms"
+				f" repr {record['seconds']['repr'] * 1000:9.1f} ms"
+				f" rss {record['peak_rss_kib'] / 1024:7.1f} MiB"
+				f" {record['bytes_per_palette']:8.1f} B/palette"
+				f" {record['blocks_per_palette']:5.1f} blocks/palette",
+				flush=True,
+			)
+			records.append(record)
+
+	return records
+
+
+def compare(records: list[dict], baseline: list[dict], tolerance: float = 1.2) -> list[str]:
+	"""Compare benchmark records against a baseline of the same configurations and engines.
+
+	Arguments:
+		records: the current benchmark records
+		baseline: benchmark records saved before
+		tolerance: slowdown or memory growth ratio beyond which a difference counts as a regression
+			default: 20% worse
+
+	Returns:
+		a description of each regression
+	"""
+	baseline_records = {(json.dumps(record["configuration"]), record["engine"]): record for record in baseline}
+	regressions = []
+
+	for record in records:
+		baseline_record = baseline_records.get((json.dumps(record["configuration"]), record["engine"]))
+
+		if baseline_record is None:
+			continue
+
+		for metric, current, previous in (
+			("palettes", record["palettes"], baseline_record["palettes"]),
+			("time", record["seconds"]["total"], baseline_record["seconds"]["total"]),
+			("memory", record["peak_traced_bytes"], baseline_record["peak_traced_bytes"]),
+		):
+			ratio = current / previous if previous else 1.0
+			print(f" {_label(record['configuration']):32} {record['engine']:8} {metric:8} {ratio:6.2f}x")
+
+			if metric == "palettes" and current != previous or metric != "palettes" and ratio > tolerance:
+				regressions.append(f"{_label(record['configuration'])} {record['engine']} {metric} {ratio:.2f}x")
+
+	return regressions
+
+
+if __name__ == "__main__":
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument("--games", nargs="+", default=["DungeonsDragons", "Cyberpunk2077", "DiscoElysium"])
+	parser.add_argument("--tiers", type=ranges, default=list(DungeonsDragons._names))
+	parser.add_argument("--races", nargs="+", default=["all"])
+	parser.add_argument("--extras", type=ranges, default=list(range(DungeonsDragons._max_extra + 1)))
+	parser.add_argument("--levels", type=ranges, default=list(range(1, Cyberpunk2077._max_level + 1)))
+	parser.add_argument("--engines", nargs="+", default=["python"], choices=list(engines))
+	parser.add_argument("--no-isolate", action="store_true", help="measure everything in the current process")
+	parser.add_argument("--save", help="save the records as a JSON baseline")
+	parser.add_argument("--compare", help="compare the records with a JSON baseline, failing on regressions")
+	parser.add_argument("--tolerance", type=float, default=1.2)
+	arguments = parser.parse_args()
+
+	if "numpy" in arguments.engines and _numpy() is None:
+		parser.error("the numpy engine requires numpy to be installed")
+
+	records = run(
+		configurations(arguments.games, arguments.tiers, arguments.races, arguments.extras, arguments.levels),
+		arguments.engines,
+		isolate=not arguments.no_isolate,
+	)
+
+	if arguments.save:
+		with open(arguments.save, "w") as file:
+			json.dump(records, file, indent="\t")
+
+	if arguments.compare:
+		with open(arguments.compare) as file:
+			regressions = compare(records, json.load(file), arguments.tolerance)
+
+		for regression in regressions:
+			print(f" regression {regression}")
+
+		sys.exit(1 if regressions else 0)
@@ -0,0 +1,133 @@
+"""Score palette cache.
+
+Keep computed score palette sets both in an in-process LRU and in compact binary files under a cache directory,
+keyed by a digest of everything that defines them.
+"""
+
+import hashlib
+import os
+import struct
+from array import array
+from collections import OrderedDict
+from typing import Iterable
+
+
+def digest(*parts) -> str:
+	"""Return a stable hexadecimal digest of the representation of the given parts.
+
+	Arguments:
+		parts: anything with a deterministic representation, like names, sorted dictionary items and sorted tuples
+
+	Returns:
+		a digest changing whenever any of the parts changes
+	"""
+	return hashlib.sha256(repr(parts).encode()).hexdigest()
+
+
+class Cache(OrderedDict[str, list[tuple[int, ...]]]):
+	"""An LRU dictionary of sorted score palettes backed by binary files.
+
+	Each file holds a small header with the extent and count of the palettes,
+	followed by all their scores as signed 16-bit integers.
+
+	Attributes:
+		_directory: where cache files are stored
+			default: the `ABILITIES_CACHE` environment variable or `~/.cache/abilities`
+		_size: how many palette sets to keep in memory
+	"""
+
+	_header = struct.Struct("<4sII")
+	_magic = b"ABL1"
+
+	def __init__(self, directory: str | None = None, size: int = 32):
+		"""Cache constructor.
+
+		Arguments:
+			directory: where cache files are stored
+				default: the `ABILITIES_CACHE` environment variable or `~/.cache/abilities`
+			size: how many palette sets to keep in memory
+				default: 32
+		"""
+		super().__init__()
+
+		self._directory = directory or os.environ.get("ABILITIES_CACHE", os.path.expanduser("~/.cache/abilities"))
+		self._size = size
+
+	def _path(self, key: str) -> str:
+		"""Return the cache file path of a key."""
+		return os.path.join(self._directory, f"{key}.bin")
+
+	def get(self, key: str, default=None) -> list[tuple[int, ...]] | None:  # type: ignore
+		"""Get the palettes of a key from memory or else from disk.
+
+		Arguments:
+			key: a digest of the palette set definition (see `digest`)
+			default: what to return when the key is cached nowhere
+
+		Returns:
+			the sorted palettes cached under key
+		"""
+		if key in self:
+			self.move_to_end(key)
+			return self[key]
+
+		try:
+			with open(self._path(key), "rb") as file:
+				magic, extent, count = Cache._header.unpack(file.read(Cache._header.size))
+
+				if magic != Cache._magic:
+					return default
+
+				scores = array("h")
+				scores.frombytes(file.read())
+
+		except (OSError, struct.error, ValueError):
+			return default
+
+		if len(scores) != extent * count:
+			return default
+
+		palettes = [tuple(scores[start:start + extent]) for start in range(0, len(scores), extent)] if extent else [()] * count
+		self.put(key, palettes, persist=False)
+
+		return palettes
+
+	def put(self, key: str, palettes: Iterable[tuple[int, ...]], persist: bool = True):
+		"""Store palettes under a key in memory and optionally on disk.
+
+		Writing to disk is best effort, an unwritable cache directory only disables persistence.
+
+		Arguments:
+			key: a digest of the palette set definition (see `digest`)
+			palettes: the palettes to cache, that are stored sorted
+			persist: whether to also write the palettes to disk
+				default: write them to disk too
+		"""
+		palettes = sorted(palettes)
+
+		self[key] = palettes
+		self.move_to_end(key)
+
+		while len(self) > self._size:
+			self.popitem(last=False)
+
+		if not persist:
+			return
+
+		extent = len(palettes[0]) if palettes else 0
+
+		try:
+			scores = array("h", (score for scores in palettes for score in scores))
+			os.makedirs(self._directory, exist_ok=True)
+
+			with open(f"{self._path(key)}.{os.getpid()}", "wb") as file:
+				file.write(Cache._header.pack(Cache._magic, extent, len(palettes)))
+				file.write(scores.tobytes())
+
+			os.replace(f"{self._path(key)}.{os.getpid()}", self._path(key))
+
+		except (OSError, OverflowError):
+			pass
+
+
+palette_cache = Cache()
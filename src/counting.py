@@ -0,0 +1,38 @@
+"""Score palette counting.
+
+Count score palettes without building any of them, to size results and show counts instantly.
+Only base palettes are counted, before any bonus: how many augmented palettes are distinct
+depends on which sums of palettes and bonus vectors coincide, which only evaluating them tells.
+"""
+
+from collections import Counter
+
+
+def count(schema: dict[int, int], extent: int, cutoff: int | None = None) -> int:
+	"""Count the score palettes of a schema whose cost sums exactly to the cutoff (see `Abilities`).
+
+	The count is the coefficient of x^cutoff y^extent in the generating function
+	of the product of 1 / (1 - y x^cost) over all scores in the schema,
+	expanded one score at a time as a polynomial in x for each power of y.
+
+	Arguments:
+		schema: a dictionary with costs on scores
+		extent: number of attributes in ability score system
+		cutoff: the cost of viable score palettes
+			default: half the maximum cost defined by the schema, like `Abilities`
+
+	Returns:
+		the number of viable score palettes
+	"""
+	if not cutoff:
+		cutoff = (extent * max(schema.values())) // 2
+
+	polynomials: list[Counter[int]] = [Counter({0: 1})] + [Counter() for _ in range(extent)]
+
+	for cost in schema.values():
+		for slots in range(1, extent + 1):
+			for budget, ways in polynomials[slots - 1].items():
+				polynomials[slots][budget + cost] += ways
+
+	return polynomials[extent][cutoff]
+
@@ -0,0 +1,170 @@
+"""Score palette export.
+
+Write score palettes along with their statistics to compact machine-readable formats,
+and open binary exports again without regenerating or parsing anything:
+
+-	`.npy`: a structured matrix with one row per palette, opened memory-mapped
+-	`.npz`: compressed arrays of palettes and of each statistic
+-	`.csv`: one row per palette with one column per score and statistic
+-	`.jsonl`: one JSON object per palette
+
+The binary formats require the optional numpy package.
+"""
+
+import csv
+import json
+import os
+from collections import Counter
+from typing import Iterable, Iterator
+
+from .abilities import Abilities, Scores, _numpy
+
+formats = {".npy", ".npz", ".csv", ".jsonl"}
+
+
+def statistics(scores: Scores, spectrum: list[int], mod: int) -> tuple[int, int, int, list[int], list[int]]:
+	"""Compute the statistics printed along a score palette (see `Scores.__repr__`).
+
+	Arguments:
+		scores: a score palette
+		spectrum: possible scores for the distribution
+		mod: base of multiples scores are checked against
+
+	Returns:
+		sum, mod count, type, pattern and distribution of the score palette
+	"""
+	counts = Counter(scores)
+	distribution = [counts[score] for score in spectrum]
+	pattern = Counter(distribution)
+	pattern = [pattern[count + 1] for count in range(len(scores))]
+
+	return sum(scores), scores % mod, sum(pattern), pattern, distribution
+
+
+def _dtype(extent: int, spectrum: list[int]):
+	"""Get the structured row type of `.npy` exports, naming one distribution field after each score of the spectrum."""
+	numpy = _numpy()
+
+	return numpy.dtype(
+		[
+			("scores", numpy.int16, (extent,)),
+			("sum", numpy.int16),
+			("mod", numpy.int16),
+			("type", numpy.int16),
+			("pattern", numpy.int16, (extent,)),
+		] + [
+			(f"distribution{score}", numpy.int16) for score in spectrum
+		]
+	)
+
+
+def export(abilities: Abilities, path: str | os.PathLike, spectrum: Iterable[int] | None = None, mod: int | None = None):
+	"""Write all score palettes of an attribute score system with their statistics to a file.
+
+	The format follows the file extension (see `formats`).
+	Palettes are streamed in ascending order, so lazy attribute score systems are exported without materialising them,
+	except for `.npz` files that compress whole arrays.
+
+	Arguments:
+		abilities: the attribute score system to export
+		path: the file to write
+		spectrum: possible scores for the distribution
+			default: the spectrum the attribute score system prints with
+		mod: base of multiples scores are checked against
+			default: the mod the attribute score system prints with
+	"""
+	extension = os.path.splitext(path)[1]
+
+	if extension not in formats:
+		raise ValueError(f"unknown export format {extension!r}, choose one of {sorted(formats)}")
+
+	numpy = _numpy() if extension in {".npy", ".npz"} else None  # text formats never import it
+
+	if extension in {".npy", ".npz"} and numpy is None:
+		raise ImportError(f"exporting {extension} files requires numpy to be installed")
+
+	if spectrum is None:
+		spectrum = abilities._spectrum if abilities._spectrum is not None else abilities._schema
+
+	spectrum = sorted(spectrum)
+	mod = abilities._mod if mod is None else mod
+	rows = ((scores, *statistics(scores, spectrum, mod)) for scores in abilities.iter_palettes())
+
+	if extension == ".npy":
+		numpy.save(path, numpy.fromiter(
+			((scores, total, modded, _type, pattern, *distribution) for scores, total, modded, _type, pattern, distribution in rows),
+			dtype=_dtype(abilities._extent, spectrum),
+		))
+
+	if extension == ".npz":
+		columns = list(zip(*rows)) or [[]] * 6
+		numpy.savez_compressed(path,
+			scores=numpy.array(columns[0], dtype=numpy.int16).reshape(-1, abilities._extent),
+			sum=numpy.array(columns[1], dtype=numpy.int16),
+			mod=numpy.array(columns[2], dtype=numpy.int16),
+			type=numpy.array(columns[3], dtype=numpy.int16),
+			pattern=numpy.array(columns[4], dtype=numpy.int16).reshape(-1, abilities._extent),
+			distribution=numpy.array(columns[5], dtype=numpy.int16).reshape(-1, len(spectrum)),
+			spectrum=numpy.array(spectrum, dtype=numpy.int16),
+		)
+
+	if extension == ".csv":
+		with open(path, "w", newline="") as file:
+			writer = csv.writer(file)
+			writer.writerow(
+				[f"score{index + 1}" for index in range(abilities._extent)] +
+				["sum", "mod", "type"] +
+				[f"pattern{count + 1}" for count in range(abilities._extent)] +
+				[f"distribution{score}" for score in spectrum]
+			)
+			writer.writerows([*scores, total, modded, _type, *pattern, *distribution] for scores, total, modded, _type, pattern, distribution in rows)
+
+	if extension == ".jsonl":
+		with open(path, "w") as file:
+			for scores, total, modded, _type, pattern, distribution in rows:
+				file.write(json.dumps({
+					"scores": list(scores),
+					"sum": total,
+					"mod": modded,
+					"type": _type,
+					"pattern": pattern,
+					"distribution": dict(zip(map(str, spectrum), distribution)),
+				}) + "\n")
+
+
+def load(path: str | os.PathLike):
+	"""Open a binary export of score palettes without parsing or copying it.
+
+	Arguments:
+		path: an `.npy` or `.npz` file written by `export`
+
+	Returns:
+		for `.npy` files a read-only memory-mapped structured array with a row per palette,
+		for `.npz` files a lazily loading mapping from column names to arrays
+	"""
+	extension = os.path.splitext(path)[1]
+
+	if extension not in {".npy", ".npz"}:
+		raise ValueError(f"only binary exports can be loaded, read {extension!r} files with the csv or json modules")
+
+	numpy = _numpy()
+
+	if numpy is None:
+		raise ImportError(f"loading {extension} files requires numpy to be installed")
+
+	return numpy.load(path, mmap_mode="r" if extension == ".npy" else None)
+
+
+def palettes(exported) -> Iterator[Scores]:
+	"""Iterate over the score palettes of a loaded binary export (see `load`).
+
+	Arguments:
+		exported: a loaded `.npy` or `.npz` export
+
+	Yields:
+		score palettes in ascending order
+	"""
+	scores = exported["scores"]
+
+	for start in range(0, len(scores), 1 << 16):  # unpack in chunks to keep memory-mapped exports paged out
+		yield from map(Scores, scores[start:start + (1 << 16)].tolist())
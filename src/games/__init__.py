@@ -0,0 +1,23 @@
+"""Games, either hand-written `Abilities` subclasses or declarative definitions in TOML files (see `declarative`)."""
+
+import os
+
+directory = os.path.dirname(__file__)
+
+
+def definitions() -> dict[str, str]:
+	"""Find the declarative game definitions next to the game modules, without compiling them (see `declarative`).
+
+	Returns:
+		the name of each game by the name of its definition file without extension
+	"""
+	import tomllib  # only the game menu and declarative games read definitions
+
+	games = {}
+
+	for file in sorted(os.listdir(directory)):
+		if file.endswith(".toml"):
+			with open(os.path.join(directory, file), "rb") as definition:
+				games[file.removesuffix(".toml")] = tomllib.load(definition).get("name", file.removesuffix(".toml"))
+
+	return games
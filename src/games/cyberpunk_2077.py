@@ -6,41 +6,112 @@ level range: 1-50
 """
 
 
-import itertools
-
+from .. import augmentations, counting, lookup
 from ..abilities import Abilities, Schema
+from ..cache import digest
 
 
 class Cyberpunk2077(Abilities):
-	"""Specialized Abilities class for Cyberpunk."""
+	"""Specialized Abilities class for Cyberpunk.
+
+	Attributes:
+		_level: character level with one attribute point augmenting the palettes per level up
+	"""
 
 	_definition = [3, 6]
 	_extent = 5
 
+	_spectrum = set(range(1, 21))
+	_mod = 2  # for skill unlocking checkpoints
+
 	_min_level = 1
 	_max_level = 50
 
-	def __init__(self, level: int = 1):
+	def __init__(self,
+		level: int = 1,
+		lazy: bool = False,
+		backend: str = "python",
+		workers: int = 1,
+		cache: bool = False,
+		residual: bool = False,
+	):
 		"""Generate a new Cyberpunk 2077 attribute score system.
 
 		Arguments:
 			level: additional ability points
 				default: 0
+			lazy: stream score palettes on demand instead of storing them
+				default: evaluate and store all score palettes
+			backend: the engine augmenting stored palettes, "numpy" requiring the optional numpy package
+				default: plain python score palette addition
+			workers: number of processes to evaluate score palettes with
+				default: evaluate everything in the current process
+			cache: look palettes up in the palette cache before evaluating them and store them there after
+				default: always evaluate palettes
+			residual: keep palettes spending less than all points too, grouped by points left (see `Abilities.residual`)
+				default: keep palettes spending all points
 		"""
-		super().__init__(Schema(definition=Cyberpunk2077._definition), Cyberpunk2077._extent)
+		super().__init__(
+			Schema(definition=Cyberpunk2077._definition),
+			Cyberpunk2077._extent,
+			lazy=lazy,
+			backend=backend,
+			workers=workers,
+			cache=cache,
+			residual=residual,
+		)
+
+		self._level = min(max(level, Cyberpunk2077._min_level), Cyberpunk2077._max_level)
 
-		if level - 1:
-			level = min(max(level, Cyberpunk2077._min_level), Cyberpunk2077._max_level)
+		if self._level - 1:
+			super().augment(augmentations.spreads(self._level - 1, Cyberpunk2077._extent))
 
-			_levels = Abilities(Schema([0, level - 1]), Cyberpunk2077._extent, cutoff=level - 1)
-			_augmentations = set()
+	@classmethod
+	def count(cls) -> int:
+		"""Count score palettes at level 1 without evaluating them (see `counting.count`)."""
+		return counting.count(Schema(definition=Cyberpunk2077._definition), Cyberpunk2077._extent)
+
+	@classmethod
+	def derivation(cls, target: tuple[int, ...], level: int = 1, residual: bool = False) -> lookup.Derivation | None:
+		"""Check whether a score palette is reachable without evaluating any palette, and how (see `lookup.derivation`).
+
+		Arguments:
+			target: the score palette to check, in any order
+			level: character level with one attribute point per level up
+			residual: allow base palettes spending less than all points (see `Abilities.residual`)
 
-			for augmentation in _levels:
-				_augmentations.update(itertools.permutations(
-					augmentation, Cyberpunk2077._extent))
+		Returns:
+			the cheapest derivation of the score palette, or nothing if it is unreachable
+		"""
+		schema = Schema(definition=Cyberpunk2077._definition)
+		points = min(max(level, Cyberpunk2077._min_level), Cyberpunk2077._max_level) - 1
+
+		return lookup.derivation(
+			target,
+			schema,
+			Cyberpunk2077._extent,
+			(Cyberpunk2077._extent * max(schema.values())) // 2,
+			points=points,
+			within=residual,
+		)
+
+	def increment(self) -> "Cyberpunk2077":
+		"""Derive the attribute score system of the next level from this one.
+
+		Each level adds one attribute point anywhere,
+		so the derivation costs a single-point augmentation of the current palettes instead of a full evaluation.
+		The result is cached like the full evaluation would be.
+
+		Returns:
+			the same Cyberpunk 2077 attribute score system one level up, or this one at the maximum level
+		"""
+		if self._level == Cyberpunk2077._max_level:
+			return self
 
-			super().augment(_augmentations)
+		incremented = self._derive(
+			augmentations.spreads(1, Cyberpunk2077._extent),
+			key=digest(self._base_key(), augmentations.definition(points=self._level)),
+		)
+		incremented._level += 1
 
-	def __repr__(self) -> str:
-		"""Wrap Abilities print with mod 2 for skill unlocking checkpoints."""
-		return super().__repr__(spectrum=set(range(1, 21)), mod=2)
+		return incremented  # type: ignore
@@ -0,0 +1,267 @@
+"""Declarative game ability scoring.
+
+Games defined in a TOML file next to the game modules need no Python of their own,
+like `pathfinder.toml` for Pathfinder point-buy:
+
+	Game("pathfinder", "standard", "Dwarf", level=8)
+
+A definition has a name, an extent, a spectrum as its lowest and highest score, and a mod.
+Its `schema` table holds either checkpoints (see `Schema`) or the costs of each score, which may be negative,
+along with an optional cutoff. Its optional `tiers` table overrides any of these by tier name, the first tier being the default.
+Its optional `races` table holds a bonus going anywhere for each race, or a table of them for each subrace of a race.
+Its optional `levels` table holds the level range and the levels awarding one ability point anywhere,
+every so many levels from a starting level on.
+
+Each definition is compiled once into the schemas and arranged bonus vectors the engines consume,
+so declarative games run on the same evaluation, augmentation, cache and lookup paths as hand-written ones.
+"""
+
+import functools
+import os
+
+from .. import augmentations, counting, lookup
+from ..abilities import Abilities, Schema
+from . import directory
+
+
+class Definition:
+	"""A declarative game definition compiled into lookup tables.
+
+	Attributes:
+		name: the game name
+		extent: number of attributes in ability score system
+		spectrum: scores printed in distributions
+		mod: base of multiples counted when printing
+		tiers: the schema and cutoff of each tier, the default tier first
+		races: the bonus of each race, or of each subrace of each race (see `DungeonsDragons._races`)
+		bonuses: all distinct arrangements of each race or subrace bonus over the attributes
+		min_level: the lowest level
+		max_level: the highest level
+		start: the first level awarding an ability point
+		every: how many levels apart ability points are awarded
+
+	Methods:
+		bonus: the bonus of a race and subrace
+		points: the ability points awarded up to a level
+		augmentations: the race bonuses and ability points combined in a single set of bonus vectors
+		count: count score palettes before augmentation without evaluating them
+		derivation: check whether a score palette is reachable without evaluating any palette
+	"""
+
+	def __init__(self, definition: dict):
+		"""Compile a parsed definition.
+
+		Arguments:
+			definition: the contents of a definition file (see module documentation)
+		"""
+		self.name: str = definition["name"]
+		self.extent: int = definition["extent"]
+		self.spectrum = set(range(definition["spectrum"][0], definition["spectrum"][1] + 1)) if "spectrum" in definition else None
+		self.mod: int = definition.get("mod", 1)
+
+		self.tiers: dict[str, tuple[Schema, int | None]] = {}
+
+		for tier, overrides in (definition.get("tiers") or {"default": {}}).items():
+			schema = definition.get("schema", {}) | overrides
+
+			if "costs" in schema:
+				self.tiers[tier] = (Schema(dict(sorted((int(score), cost) for score, cost in schema["costs"].items()))), schema.get("cutoff"))
+
+			elif "checkpoints" in schema:
+				self.tiers[tier] = (Schema(definition=list(schema["checkpoints"])), schema.get("cutoff"))
+
+			else:
+				raise ValueError(f"tier {tier!r} of {self.name} has neither costs nor checkpoints")
+
+		self.races: dict[str, tuple[int, ...] | dict[str, tuple[int, ...]]] = {
+			race: {subrace: tuple(bonus) for subrace, bonus in bonus.items()} if isinstance(bonus, dict) else tuple(bonus)
+			for race, bonus in definition.get("races", {}).items()
+		}
+		self.bonuses: dict[tuple[str, str | None], frozenset[tuple[int, ...]]] = {
+			(race, subrace): augmentations.permutations(bonus + (0,) * (self.extent - len(bonus)), self.extent)
+			for race, bonuses in self.races.items()
+			for subrace, bonus in (bonuses.items() if isinstance(bonuses, dict) else [(None, bonuses)])
+		}
+
+		levels = definition.get("levels", {})
+		self.min_level: int = levels.get("min", 1)
+		self.max_level: int = levels.get("max", self.min_level)
+		self.start: int = levels.get("start", self.min_level + 1)
+		self.every: int = levels.get("every", 1)
+
+	def bonus(self, race: str | None = None, subrace: str | None = None) -> tuple[int, ...]:
+		"""Get the bonus of a race, refined by a subrace when the race has any, or no bonus without a race."""
+		return (self.races[race][subrace] if subrace else self.races[race]) if race else ()  # type: ignore
+
+	def points(self, level: int | None = None) -> int:
+		"""Get the ability points awarded up to a level, clamped to the level range, or none without a level."""
+		if level is None:
+			return 0
+
+		level = min(max(level, self.min_level), self.max_level)
+
+		return max(0, (level - self.start) // self.every + 1)
+
+	def augmentations(self, race: str | None = None, subrace: str | None = None, points: int = 0) -> frozenset[tuple[int, ...]]:
+		"""Get the race bonus and ability points combined in a single set of bonus vectors (see `DungeonsDragons.augmentations`).
+
+		Arguments:
+			race: the race whose bonus goes anywhere in the score palettes
+				default: no race bonus
+			subrace: refine the race bonus with subrace specifics when applicable
+				default: no subrace bonus applies
+			points: ability points to spread anywhere in the score palettes
+				default: 0
+
+		Returns:
+			all distinct bonus vectors augmenting a score palette in one go
+		"""
+		_augmentations = self.bonuses[race, subrace or None] if race else augmentations.spreads(0, self.extent)  # no bonus
+
+		if points:
+			_augmentations = augmentations.sums(_augmentations, augmentations.spreads(points, self.extent))
+
+		return _augmentations
+
+	def count(self, tier: str | None = None) -> int:
+		"""Count score palettes before augmentation without evaluating them (see `counting.count`).
+
+		Arguments:
+			tier: the tier whose schema and cutoff to use (see `Game`)
+
+		Returns:
+			the exact number of score palettes before any race bonus or ability point
+		"""
+		schema, cutoff = self.tiers[tier or next(iter(self.tiers))]
+
+		return counting.count(schema, self.extent, cutoff)
+
+	def derivation(
+		self,
+		target: tuple[int, ...],
+		tier: str | None = None,
+		race: str | None = None,
+		subrace: str | None = None,
+		level: int | None = None,
+		extra: int = 0,
+		residual: bool = False,
+	) -> lookup.Derivation | None:
+		"""Check whether a score palette is reachable without evaluating any palette, and how (see `lookup.derivation`).
+
+		Arguments:
+			target: the score palette to check, in any order
+			tier, race, subrace, level, extra: the game set-up (see `Game`)
+			residual: allow base palettes spending less than all points (see `Abilities.residual`)
+
+		Returns:
+			the cheapest derivation of the score palette, or nothing if it is unreachable
+		"""
+		schema, cutoff = self.tiers[tier or next(iter(self.tiers))]
+
+		return lookup.derivation(
+			target,
+			schema,
+			self.extent,
+			cutoff or (self.extent * max(schema.values())) // 2,
+			self.bonus(race, subrace),
+			self.points(level) + extra,
+			within=residual,
+		)
+
+
+@functools.cache
+def compiled(game: str) -> Definition:
+	"""Compile a game definition once and share it from then on.
+
+	Arguments:
+		game: the name of the definition file without extension, like "pathfinder"
+
+	Returns:
+		the compiled game definition
+	"""
+	import tomllib  # only declarative games read definitions
+
+	with open(os.path.join(directory, f"{game}.toml"), "rb") as file:
+		return Definition(tomllib.load(file))
+
+
+class Game(Abilities):
+	"""Abilities class of a declarative game.
+
+	Attributes:
+		_game: the name of the definition file of the game
+		_definition: the compiled game definition
+		_tier: the tier whose schema and cutoff are in use
+		_race: the race whose bonus augments the palettes
+		_subrace: the subrace refining the race bonus
+		_level: character level awarding ability points augmenting the palettes
+		_extra: additional ability points augmenting the palettes
+	"""
+
+	def __init__(self,
+		game: str,
+		tier: str | None = None,
+		race: str | None = None,
+		subrace: str | None = None,
+		level: int | None = None,
+		extra: int = 0,
+		lazy: bool = False,
+		backend: str = "python",
+		workers: int = 1,
+		cache: bool = False,
+		residual: bool = False,
+	):
+		"""Generate a new attribute score system of a declarative game.
+
+		Arguments:
+			game: the name of the definition file without extension, like "pathfinder"
+			tier: the tier whose schema and cutoff to use
+				default: the first tier of the definition
+			race: modifiy score palettes with possibilities infered from chosen race
+				default: vanilla score palettes
+			subrace: refine the race modifier with subrace specifics when applicable
+				default: no subrace modifications apply
+			level: character level, awarding the ability points of the level rules
+				default: no ability points from levels
+			extra: additional ability points
+				default: 0
+			lazy: stream score palettes on demand instead of storing them
+				default: evaluate and store all score palettes
+			backend: the engine augmenting stored palettes, "numpy" requiring the optional numpy package
+				default: plain python score palette addition
+			workers: number of processes to evaluate score palettes with
+				default: evaluate everything in the current process
+			cache: look palettes up in the palette cache before evaluating them and store them there after
+				default: always evaluate palettes
+			residual: keep palettes spending less than all points too, grouped by points left (see `Abilities.residual`)
+				default: keep palettes spending all points
+		"""
+		definition = compiled(game)
+		tier = tier or next(iter(definition.tiers))
+		schema, cutoff = definition.tiers[tier]
+
+		super().__init__(
+			schema,
+			definition.extent,
+			cutoff,
+			lazy=lazy,
+			backend=backend,
+			workers=workers,
+			cache=cache,
+			residual=residual,
+		)
+
+		self._game = game
+		self._definition = definition
+		self._spectrum = definition.spectrum
+		self._mod = definition.mod
+		self._tier = tier
+		self._race = race
+		self._subrace = subrace
+		self._level = level
+		self._extra = extra
+
+		points = definition.points(level) + extra
+
+		if race or points:
+			super().augment(definition.augmentations(race, subrace, points))
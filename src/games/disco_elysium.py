@@ -18,10 +18,37 @@ class DiscoElysium(Abilities):
 	_extent = 4
 	_cutoff = 2 * _extent
 
-	def __init__(self):
-		"""Generate a new Disco Elysium attribute score system."""
-		super().__init__(Schema(definition=DiscoElysium._definition), DiscoElysium._extent, cutoff=DiscoElysium._cutoff)
-
-	def __repr__(self) -> str:
-		"""Wrap Abilities print with mod 2."""
-		return super().__repr__(spectrum=set(range(1, 7)), mod=2)
+	_spectrum = set(range(1, 7))
+	_mod = 2
+
+	def __init__(self,
+		lazy: bool = False,
+		backend: str = "python",
+		workers: int = 1,
+		cache: bool = False,
+		residual: bool = False,
+	):
+		"""Generate a new Disco Elysium attribute score system.
+
+		Arguments:
+			lazy: stream score palettes on demand instead of storing them
+				default: evaluate and store all score palettes
+			backend: the engine augmenting stored palettes, "numpy" requiring the optional numpy package
+				default: plain python score palette addition
+			workers: number of processes to evaluate score palettes with
+				default: evaluate everything in the current process
+			cache: look palettes up in the palette cache before evaluating them and store them there after
+				default: always evaluate palettes
+			residual: keep palettes spending less than all points too, grouped by points left (see `Abilities.residual`)
+				default: keep palettes spending all points
+		"""
+		super().__init__(
+			Schema(definition=DiscoElysium._definition),
+			DiscoElysium._extent,
+			cutoff=DiscoElysium._cutoff,
+			lazy=lazy,
+			backend=backend,
+			workers=workers,
+			cache=cache,
+			residual=residual,
+		)
@@ -6,9 +6,9 @@ level range: 1-20
 """
 
 
-import itertools
-
+from .. import augmentations, counting, lookup
 from ..abilities import Abilities, Schema
+from ..cache import digest
 
 
 class DungeonsDragons(Abilities):
@@ -17,10 +17,16 @@ class DungeonsDragons(Abilities):
 	Not only it includes the special D&D score schemas,
 	but implements augmenting printed scores with chosen race specific modifiers.
 
+	Attributes:
+			_tier: the D&D score schema in use
+			_race: the race whose bonus augments the palettes
+			_subrace: the subrace refining the race bonus
+			_extra: additional ability points augmenting the palettes
+
 	Static Attrtibutes:
 			_names: names for D&D score schemas
 			_definitions: the D&D score schemas (see Abilities class)
-			_races: the augmenting patterns for each race and subrace in D&D
+			_races: the augmenting bonuses for each race and subrace in D&D, in any order
 	"""
 
 	_names = {
@@ -43,42 +49,55 @@ class DungeonsDragons(Abilities):
 	}
 	_extent = 6
 
+	_spectrum = set(range(1, 21))
+	_mod = 2  # for even scores
+
 	_min_extra = 0
 	_max_extra = 14
 
-#       races                                        S  D  C  I  W  C
-#           subraces                                 T  E  O  N  I  H
-#                        modifiers                   R  X  N  T  S  A
+#       races             S  D  C  I  W  C
+#           subraces      T  E  O  N  I  H
+#               modifiers R  X  N  T  S  A
 	_races = {
-#       "-":             set(itertools.permutations((0, 0, 0, 0, 0, 0), 6)),
+#       "-":             (0, 0, 0, 0, 0, 0),
 		"Dwarf": {
-			"Hill":      set(itertools.permutations((0, 0, 2, 0, 1, 0), 6)),
-			"Mountain":  set(itertools.permutations((2, 0, 2, 0, 0, 0), 6)),
+			"Hill":      (0, 0, 2, 0, 1, 0),
+			"Mountain":  (2, 0, 2, 0, 0, 0),
 		},
 		"Elf": {
-			"High":      set(itertools.permutations((0, 2, 0, 1, 0, 0), 6)),
-			"Wood":      set(itertools.permutations((0, 2, 0, 0, 1, 0), 6)),
-			"Dark":      set(itertools.permutations((0, 2, 0, 0, 0, 1), 6)),
+			"High":      (0, 2, 0, 1, 0, 0),
+			"Wood":      (0, 2, 0, 0, 1, 0),
+			"Dark":      (0, 2, 0, 0, 0, 1),
 		},
 		"Halfling": {
-			"Lightfoot": set(itertools.permutations((0, 2, 0, 0, 0, 1), 6)),
-			"Stout":     set(itertools.permutations((0, 2, 1, 0, 0, 0), 6)),
+			"Lightfoot": (0, 2, 0, 0, 0, 1),
+			"Stout":     (0, 2, 1, 0, 0, 0),
 		},
 		"Human": {
-			"Standard":  set(itertools.permutations((1, 1, 1, 1, 1, 1), 6)),
-			"Variant":   set(itertools.permutations((1, 1, 0, 0, 0, 0), 6)),
+			"Standard":  (1, 1, 1, 1, 1, 1),
+			"Variant":   (1, 1, 0, 0, 0, 0),
 		},
-		"Dragonborn":    set(itertools.permutations((2, 0, 0, 0, 0, 1), 6)),
+		"Dragonborn":    (2, 0, 0, 0, 0, 1),
 		"Gnome": {
-			"Forest":    set(itertools.permutations((0, 1, 0, 2, 0, 0), 6)),
-			"Rock":      set(itertools.permutations((0, 0, 1, 2, 0, 0), 6)),
+			"Forest":    (0, 1, 0, 2, 0, 0),
+			"Rock":      (0, 0, 1, 2, 0, 0),
 		},
-		"Halfelf":       set(itertools.permutations((1, 0, 1, 0, 0, 2), 6)),
-		"Halforc":       set(itertools.permutations((2, 0, 1, 0, 0, 0), 6)),
-		"Tiefling":      set(itertools.permutations((0, 0, 0, 1, 0, 2), 6)),
+		"Halfelf":       (1, 0, 1, 0, 0, 2),
+		"Halforc":       (2, 0, 1, 0, 0, 0),
+		"Tiefling":      (0, 0, 0, 1, 0, 2),
 	}
 
-	def __init__(self, tier: int = 2, race: str | None = None, subrace: str | None = None, extra: int = 0):
+	def __init__(self,
+		tier: int = 2,
+		race: str | None = None,
+		subrace: str | None = None,
+		extra: int = 0,
+		lazy: bool = False,
+		backend: str = "python",
+		workers: int = 1,
+		cache: bool = False,
+		residual: bool = False,
+	):
 		"""Generate a new D&D attribute score system.
 
 		Arguments:
@@ -92,27 +111,136 @@ class DungeonsDragons(Abilities):
 				The actual chosen number can vary, according to user levellin-up choices
 			extra: additional ability points
 				default: 0
+			lazy: stream score palettes on demand instead of storing them
+				default: evaluate and store all score palettes
+			backend: the engine augmenting stored palettes, "numpy" requiring the optional numpy package
+				default: plain python score palette addition
+			workers: number of processes to evaluate score palettes with
+				default: evaluate everything in the current process
+			cache: look palettes up in the palette cache before evaluating them and store them there after
+				default: always evaluate palettes
+			residual: keep palettes spending less than all points too, grouped by points left (see `Abilities.residual`)
+				default: keep palettes spending all points
 		"""
-		super().__init__(Schema(definition=DungeonsDragons._definitions[tier]), DungeonsDragons._extent)
+		super().__init__(
+			Schema(definition=DungeonsDragons._definitions[tier]),
+			DungeonsDragons._extent,
+			lazy=lazy,
+			backend=backend,
+			workers=workers,
+			cache=cache,
+			residual=residual,
+		)
+
+		self._tier = tier
+		self._race = race
+		self._subrace = subrace
+		self._extra = min(max(extra, DungeonsDragons._min_extra), DungeonsDragons._max_extra)
+
+		if race or extra:
+			super().augment(DungeonsDragons.augmentations(race, subrace, extra))
+
+	@classmethod
+	def count(cls, tier: int = 2) -> int:
+		"""Count score palettes before augmentation without evaluating them (see `counting.count`).
 
-		if race:
-			if subrace:
-				super().augment(DungeonsDragons._races[race][subrace])
+		Arguments:
+			tier: level of D&D point-by expanse (see `__init__`)
 
-			else:
-				super().augment(DungeonsDragons._races[race])
+		Returns:
+			the exact number of score palettes before any race or extra ability point bonus
+		"""
+		return counting.count(Schema(definition=DungeonsDragons._definitions[tier]), DungeonsDragons._extent)
+
+	@classmethod
+	def derivation(
+		cls,
+		target: tuple[int, ...],
+		tier: int = 2,
+		race: str | None = None,
+		subrace: str | None = None,
+		extra: int = 0,
+		residual: bool = False,
+	) -> lookup.Derivation | None:
+		"""Check whether a score palette is reachable without evaluating any palette, and how (see `lookup.derivation`).
+
+		Example:
+			DungeonsDragons.derivation((17, 16, 15, 10, 8, 8), 2, "Dwarf", "Hill", 2) answers whether a Hill Dwarf
+			with two extra ability points can have these scores, with the point-buy costs of the base scores.
 
-		if extra:
-			extra = min(max(extra, DungeonsDragons._min_extra), DungeonsDragons._max_extra)
+		Arguments:
+			target: the score palette to check, in any order
+			tier: level of D&D point-by expanse (see `__init__`)
+			race: the race whose bonus goes anywhere in the score palettes
+			subrace: refine the race bonus with subrace specifics when applicable
+			extra: additional ability points to spread anywhere in the score palettes
+			residual: allow base palettes spending less than all points (see `Abilities.residual`)
+
+		Returns:
+			the cheapest derivation of the score palette, or nothing if it is unreachable
+		"""
+		schema = Schema(definition=DungeonsDragons._definitions[tier])
+		bonus = (DungeonsDragons._races[race][subrace] if subrace else DungeonsDragons._races[race]) if race else ()  # type: ignore
+		extra = min(max(extra, DungeonsDragons._min_extra), DungeonsDragons._max_extra)
+
+		return lookup.derivation(
+			target,
+			schema,
+			DungeonsDragons._extent,
+			(DungeonsDragons._extent * max(schema.values())) // 2,
+			bonus,
+			extra,
+			within=residual,
+		)
+
+	def increment(self) -> "DungeonsDragons":
+		"""Derive the attribute score system with one more extra ability point from this one.
+
+		Spreading extra + 1 points is spreading extra points and then one more point anywhere,
+		so the derivation costs a single-point augmentation of the current palettes instead of a full evaluation.
+		The result is cached like the full evaluation would be, keyed by the race bonus and extra points alone,
+		so that the bonus vectors of the full evaluation are never built.
+
+		Returns:
+			the same D&D attribute score system with one more extra ability point, or this one at the maximum
+		"""
+		if self._extra == DungeonsDragons._max_extra:
+			return self
 
-			_extras = Abilities(Schema([0, extra]), DungeonsDragons._extent, cutoff=extra)
-			_augmentations = set()
+		bonus = (DungeonsDragons._races[self._race][self._subrace] if self._subrace else DungeonsDragons._races[self._race]) if self._race else ()  # type: ignore
+		incremented = self._derive(
+			augmentations.spreads(1, DungeonsDragons._extent),
+			key=digest(self._base_key(), augmentations.definition([bonus], self._extra + 1)),
+		)
+		incremented._extra += 1
 
-			for augmentation in _extras:
-				_augmentations.update(itertools.permutations(augmentation, DungeonsDragons._extent))
+		return incremented  # type: ignore
 
-			super().augment(_augmentations)
+	@classmethod
+	def augmentations(cls, race: str | None = None, subrace: str | None = None, extra: int = 0) -> frozenset[tuple[int, ...]]:
+		"""Get the race and extra ability point bonuses combined in a single set of bonus vectors.
+
+		Arguments:
+			race: the race whose bonus goes anywhere in the score palettes
+				default: no race bonus
+			subrace: refine the race bonus with subrace specifics when applicable
+				default: no subrace bonus applies
+			extra: additional ability points to spread anywhere in the score palettes
+				default: 0
+
+		Returns:
+			all distinct bonus vectors augmenting a score palette in one go
+		"""
+		_augmentations = augmentations.spreads(0, DungeonsDragons._extent)  # no bonus
+
+		if race:
+			_augmentations = augmentations.permutations(
+				DungeonsDragons._races[race][subrace] if subrace else DungeonsDragons._races[race],  # type: ignore
+				DungeonsDragons._extent,
+			)
+
+		if extra:
+			extra = min(max(extra, DungeonsDragons._min_extra), DungeonsDragons._max_extra)
+			_augmentations = augmentations.sums(_augmentations, augmentations.spreads(extra, DungeonsDragons._extent))
 
-	def __repr__(self) -> str:
-		"""Wrap Abilities print with mod 2 for even scores."""
-		return super().__repr__(spectrum=set(range(1, 21)), mod=2)
+		return _augmentations
@@ -0,0 +1,184 @@
+"""Hot path instrumentation.
+
+Record counters and timings of each phase of palette evaluation and printing, only while explicitly asked to:
+
+	with recording() as stats:
+		repr(DungeonsDragons(2, "Human", "Standard", 4))
+
+	print(stats.export())
+
+Instrumented phases are wrapped in place for the duration of the recording and restored afterwards,
+so the hot paths run their original code, at no cost, when nothing is recorded.
+
+Printing a whole attribute score system goes through `Abilities.__repr__` and `render`, which format cells directly,
+so `Scores.__repr__` and `int_str` are only timed when single palettes are printed.
+Modules printing palettes, like `view` for the menus, call `render` through the `abilities` module,
+so that they run the instrumented one while recording.
+"""
+
+import functools
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+
+class Stats:
+	"""Counters and timings of instrumented phases.
+
+	Attributes:
+		counters: named counts, like combinations accepted or bytes formatted
+		calls: number of calls of each instrumented phase
+		seconds: total wall time spent in each instrumented phase, nested phases included
+	"""
+
+	def __init__(self):
+		"""Start with no counts."""
+		self.counters: dict[str, int] = {}
+		self.calls: dict[str, int] = {}
+		self.seconds: dict[str, float] = {}
+
+	def add(self, name: str, amount: int = 1):
+		"""Add to a named counter.
+
+		Arguments:
+			name: the counter name
+			amount: how much to add
+				default: count one
+		"""
+		self.counters[name] = self.counters.get(name, 0) + amount
+
+	@contextmanager
+	def timed(self, name: str) -> Iterator[None]:
+		"""Count a call of a phase, or a step of a streaming one, and add its wall time.
+
+		Arguments:
+			name: the phase name
+		"""
+		start = time.perf_counter()
+
+		try:
+			yield
+
+		finally:
+			self.calls[name] = self.calls.get(name, 0) + 1
+			self.seconds[name] = self.seconds.get(name, 0.) + time.perf_counter() - start
+
+	def export(self) -> dict[str, dict]:
+		"""Export all statistics as plain dictionaries, ready for JSON."""
+		return {
+			"counters": dict(self.counters),
+			"calls": dict(self.calls),
+			"seconds": dict(self.seconds),
+		}
+
+
+active: Stats | None = None
+
+
+def _instrumented_init(original: Callable) -> Callable:
+	"""Time palette evaluation.
+
+	The combinations scanned and accepted are counted as they are enumerated, lazy streams included (see `abilities.combinations`).
+	"""
+	@functools.wraps(original)
+	def __init__(self, *args, **kwargs):
+		with active.timed("Abilities.__init__"):  # type: ignore
+			original(self, *args, **kwargs)
+
+	return __init__
+
+
+def _instrumented_augment(original: Callable) -> Callable:
+	"""Time palette augmentation.
+
+	The augmentations actually applied, canonical ones only (see `augmentations.canonical`),
+	and the duplicates they collapsed are counted where they are applied, lazy streams included (see `abilities._record`).
+	"""
+	@functools.wraps(original)
+	def augment(self, augmentations, *args, **kwargs):
+		with active.timed("Abilities.augment"):  # type: ignore
+			original(self, augmentations, *args, **kwargs)
+
+	return augment
+
+
+def _instrumented_format(name: str, original: Callable) -> Callable:
+	"""Time formatting and count the bytes formatted."""
+	@functools.wraps(original)
+	def format(*args, **kwargs) -> str:
+		with active.timed(name):  # type: ignore
+			formatted = original(*args, **kwargs)
+
+		active.add(f"{name}.bytes", len(formatted))  # type: ignore
+
+		return formatted
+
+	return format
+
+
+def _instrumented_render(original: Callable) -> Callable:
+	"""Time rendering while it streams and count the lines and bytes formatted."""
+	@functools.wraps(original)
+	def render(*args, **kwargs) -> Iterator[str]:
+		lines = original(*args, **kwargs)
+
+		while True:
+			with active.timed("render"):  # type: ignore
+				line = next(lines, None)
+
+			if line is None:
+				return
+
+			active.add("render.lines")  # type: ignore
+			active.add("render.bytes", len(line))  # type: ignore
+
+			yield line
+
+	return render
+
+
+@contextmanager
+def recording(stats: Stats | None = None) -> Iterator[Stats]:
+	"""Record statistics of all instrumented phases within the context.
+
+	Nested recordings go to the innermost statistics.
+
+	Arguments:
+		stats: statistics to add to
+			default: fresh statistics
+
+	Yields:
+		the statistics being recorded
+	"""
+	global active
+
+	from . import abilities
+
+	previous = active
+	active = stats if stats is not None else Stats()
+	originals = {
+		(abilities.Abilities, "__init__"): abilities.Abilities.__init__,
+		(abilities.Abilities, "augment"): abilities.Abilities.augment,
+		(abilities.Abilities, "__repr__"): abilities.Abilities.__repr__,
+		(abilities.Scores, "__repr__"): abilities.Scores.__repr__,
+		(abilities, "int_str"): abilities.int_str,
+		(abilities, "render"): abilities.render,
+	}
+
+	if previous is None:
+		abilities.Abilities.__init__ = _instrumented_init(abilities.Abilities.__init__)  # type: ignore
+		abilities.Abilities.augment = _instrumented_augment(abilities.Abilities.augment)  # type: ignore
+		abilities.Abilities.__repr__ = _instrumented_format("Abilities.__repr__", abilities.Abilities.__repr__)  # type: ignore
+		abilities.Scores.__repr__ = _instrumented_format("Scores.__repr__", abilities.Scores.__repr__)  # type: ignore
+		abilities.int_str = _instrumented_format("int_str", abilities.int_str)
+		abilities.render = _instrumented_render(abilities.render)
+
+	try:
+		yield active
+
+	finally:
+		if previous is None:
+			for (owner, name), original in originals.items():
+				setattr(owner, name, original)
+
+		active = previous
@@ -0,0 +1,146 @@
+"""Score palette reverse lookup.
+
+Tell whether a score palette is reachable in an attribute score system without enumerating any palette,
+by decomposing it into a base palette bought with the schema costs plus the bonuses on top of it:
+
+	derivation((8, 8, 10, 15, 16, 17), Schema(definition=[8, 13, 15]), 6, 27, bonus=(0, 0, 2, 0, 1, 0), points=2)
+
+Bonuses go anywhere, so the target is decomposed score by score, each taking one of the fixed bonuses left,
+a base score and the points spread on top of it, memoised on the bonuses, points and cost left.
+Only the cheapest decomposition is kept at each step, so the search stays within a few thousand steps.
+"""
+
+import bisect
+import functools
+import itertools
+
+from .abilities import Schema, Scores, int_str
+
+
+class Derivation:
+	"""A score palette decomposed into a base palette and the bonuses on top of it, score by score.
+
+	Attributes:
+		target: the derived score palette in ascending order
+		base: the base score under each target score
+		costs: the schema cost of each base score
+		bonus: the fixed bonus on each target score, like a race bonus
+		spread: the points spread on each target score, like extra ability points or levels
+	"""
+
+	def __init__(self, target: Scores, base: tuple[int, ...], costs: tuple[int, ...], bonus: tuple[int, ...], spread: tuple[int, ...]):
+		"""Record a derivation, each part aligned with the target scores."""
+		self.target = target
+		self.base = base
+		self.costs = costs
+		self.bonus = bonus
+		self.spread = spread
+
+	@property
+	def cost(self) -> int:
+		"""Get the total schema cost of the base palette."""
+		return sum(self.costs)
+
+	def __repr__(self) -> str:
+		"""Print the derivation on one line, each part aligned with the target scores."""
+		width = max(self.target)
+
+		return (
+			f" target {int_str(self.target, width)}"
+			f" base {int_str(self.base, width)}"
+			f" costs {int_str(self.costs, width)}"
+			f" bonus {int_str(self.bonus, width)}"
+			f" spread {int_str(self.spread, width)}"
+			f" cost {self.cost}"
+		)
+
+
+def derivation(
+	target: tuple[int, ...],
+	schema: Schema,
+	extent: int,
+	cutoff: int,
+	bonus: tuple[int, ...] = (),
+	points: int = 0,
+	within: bool = False,
+) -> Derivation | None:
+	"""Find the cheapest derivation of a score palette from the schema costs and bonuses, if there is any.
+
+	Arguments:
+		target: the score palette to derive, in any order
+		schema: a dictionary with costs on scores
+		extent: number of attributes in ability score system
+		cutoff: the cost of viable base palettes
+		bonus: a fixed bonus going on any attributes, like a race bonus, padded with zeros to the extent
+			default: no fixed bonus
+		points: points to spread anywhere on top of the base palette, like extra ability points or levels
+			default: no points to spread
+		within: allow base palettes costing less than the cutoff, as in residual mode (see `Abilities.residual`)
+			default: base palettes cost exactly the cutoff
+
+	Returns:
+		the derivation with the cheapest base palette, or nothing if the score palette is unreachable
+	"""
+	if len(target) != extent or len(bonus) > extent:
+		return None
+
+	target = Scores(sorted(target))
+	scores = sorted(schema)
+	lowest, highest = min(schema.values()), max(schema.values())
+	totals = list(itertools.accumulate(reversed(target), initial=0))[::-1]  # the sum of the target scores from each on
+
+	@functools.cache
+	def complete(
+		position: int,
+		gains: tuple[int, ...],
+		points: int,
+		budget: int,
+		ceiling: int,
+	) -> tuple[int, tuple[int, ...], tuple[int, ...]] | None:
+		if position == extent:
+			return (0, (), ()) if not points and (budget >= 0 if within else not budget) else None
+
+		slots = extent - position
+
+		if budget < lowest * slots or not within and budget > highest * slots:
+			return None  # the cost left can no longer be spent
+
+		if not scores[0] * slots <= totals[position] - sum(gains) - points <= scores[-1] * slots:
+			return None  # the base scores left can no longer sum up
+
+		cheapest = None
+
+		for index, gain in enumerate(gains):
+			if gain > ceiling:
+				break  # equal target scores take their bonuses in descending order
+
+			if index and gain == gains[index - 1]:
+				continue  # equal bonuses give equal derivations
+
+			rest_gains = gains[:index] + gains[index + 1:]
+			residual = target[position] - gain
+			_ceiling = gain if position + 1 < extent and target[position + 1] == target[position] else max(gains)
+
+			for score in scores[bisect.bisect_left(scores, residual - points):bisect.bisect_right(scores, residual)]:
+				rest = complete(position + 1, rest_gains, points - residual + score, budget - schema[score], _ceiling)
+
+				if rest is not None and (cheapest is None or schema[score] + rest[0] < cheapest[0]):
+					cheapest = (schema[score] + rest[0], (score,) + rest[1], (gain,) + rest[2])
+
+		return cheapest
+
+	gains = tuple(sorted(bonus + (0,) * (extent - len(bonus))))
+	found = complete(0, gains, points, cutoff, max(gains, default=0))
+
+	if found is None:
+		return None
+
+	_, base, arrangement = found
+
+	return Derivation(
+		target,
+		base,
+		tuple(schema[score] for score in base),
+		arrangement,
+		tuple(score - gain - base for score, gain, base in zip(target, arrangement, base)),
+	)
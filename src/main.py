@@ -7,28 +7,38 @@ This is the main navigation menu.
 """
 
 
+from functools import cache
+from importlib import import_module
 from re import sub
 from shutil import get_terminal_size
+from typing import TYPE_CHECKING
 
-from simple_term_menu import TerminalMenu
+from src.background import Background, Job
+from src.games import definitions
 
-from src.games.cyberpunk_2077 import Cyberpunk2077
-from src.games.disco_elysium import DiscoElysium
-from src.games.dungeons_and_dragons import DungeonsDragons
+if TYPE_CHECKING:  # game and palette modules load only once a game is picked
+	from src.view import View
 
 
 def _add_missing_control_characters_for_keys(cls, keys) -> None:
 	pass
 
 
-TerminalMenu._add_missing_control_characters_for_keys = _add_missing_control_characters_for_keys  # type: ignore
-TerminalMenu._codename_to_capname.update(
-	{
-		"left": "kcub1",
-		"right": "kcuf1",
-	}
-)
-TerminalMenu._codenames = tuple(TerminalMenu._codename_to_capname.keys())
+@cache
+def _terminal_menu() -> type:
+	"""Import the terminal menu and patch it for navigating with the arrow keys, only once a menu is to be shown."""
+	from simple_term_menu import TerminalMenu
+
+	TerminalMenu._add_missing_control_characters_for_keys = _add_missing_control_characters_for_keys  # type: ignore
+	TerminalMenu._codename_to_capname.update(
+		{
+			"left": "kcub1",
+			"right": "kcuf1",
+		}
+	)
+	TerminalMenu._codenames = tuple(TerminalMenu._codename_to_capname.keys())
+
+	return TerminalMenu
 
 
 menu_width = get_terminal_size().columns
@@ -94,8 +104,153 @@ game_dict = {
 	"Cyberpunk2077": "Cyberpunk 2077",
 	"DiscoElysium": "Disco Elysium",
 }
+declarative_games: dict[str, str] = {}  # games defined in files instead of modules, by file name, found once the menu starts
+game_modules = {
+	"DungeonsDragons": "src.games.dungeons_and_dragons",
+	"Cyberpunk2077": "src.games.cyberpunk_2077",
+	"DiscoElysium": "src.games.disco_elysium",
+}
+
+
+def load_game(game: str) -> type:
+	"""Import a game class only when it is picked, so that startup does not grow with the number of games.
+
+	Arguments:
+		game: the game class name, a key of `game_dict`
+
+	Returns:
+		the game class
+	"""
+	return getattr(import_module(game_modules[game]), game)
+
+
+def submit_dungeons_dragons(background: Background, tier: int, race: str, subrace: str, extra: int) -> Job:
+	"""Generate D&D score palettes in the background, from those with one less extra point when generated before.
+
+	Arguments:
+		background: the background generation to submit to
+		tier, race, subrace, extra: the D&D set-up (see `DungeonsDragons`)
+
+	Returns:
+		the job generating the score palettes
+	"""
+	def build():
+		previous = background.get(("DungeonsDragons", tier, race, subrace, extra - 1))
+
+		if previous is not None and previous.abilities is not None:
+			return previous.abilities.increment()  # type: ignore  # one more point on the previous palettes
+
+		return load_game("DungeonsDragons")(tier, race, subrace, extra, lazy=True, cache=True)  # streamed, so progress shows
+
+	return background.submit(("DungeonsDragons", tier, race, subrace, extra), build)
+
+
+def submit_cyberpunk(background: Background, level: int) -> Job:
+	"""Generate Cyberpunk score palettes in the background, from those of the previous level when generated before.
+
+	Arguments:
+		background: the background generation to submit to
+		level: the character level (see `Cyberpunk2077`)
+
+	Returns:
+		the job generating the score palettes
+	"""
+	def build():
+		previous = background.get(("Cyberpunk2077", level - 1))
+
+		if previous is not None and previous.abilities is not None:
+			return previous.abilities.increment()  # type: ignore  # one more point on the previous level palettes
+
+		return load_game("Cyberpunk2077")(level, lazy=True, cache=True)  # streamed, so progress shows
+
+	return background.submit(("Cyberpunk2077", level), build)
+
+
+def submit_declarative(background: Background, game: str, tier: str, race: str | None, subrace: str | None, level: int) -> Job:
+	"""Generate the score palettes of a declarative game in the background.
+
+	Arguments:
+		background: the background generation to submit to
+		game: the name of the definition file of the game, a key of `declarative_games`
+		tier, race, subrace, level: the game set-up (see `declarative.Game`)
+
+	Returns:
+		the job generating the score palettes
+	"""
+	def build():
+		return import_module("src.games.declarative").Game(game, tier, race, subrace, level, lazy=True, cache=True)  # streamed, so progress shows
+
+	return background.submit((game, tier, race, subrace, level), build)
+
+
+def status(job: Job | None) -> str:
+	"""Describe the progress of a background job for the status bar, if there is one."""
+	return f"  {job.status()}" if job is not None else ""
+
+
+def progress(job: Job):
+	"""Show the live palette count of a background job while waiting for it."""
+	print(f"\r  {job.status():<{menu_width-2}}", end="", flush=True)
+
+
+def browse(title: str, view: "View", preferred_scores: set[str]):
+	"""Page through printed score palettes, printing only the page on screen, and mark favourite ones.
+
+	Arguments:
+		title: the set-up the score palettes are for
+		view: the score palettes (see `View`)
+		preferred_scores: favourite printed score palettes, adding the ones selected
+	"""
+	height = max(1, get_terminal_size().lines - 6)  # leave room for the title and the navigation entries
+	page = 0
+	scores_index = 1
+
+	while scores_index is not None:
+		start = page * height
+		scores_list = [
+			f"{'+' if start + row in view.marked else ' '}{key:<{menu_width-1}}"
+			for row, key in enumerate(view.page(page, height))
+		]
+		scores_index = _terminal_menu()(
+			[
+				f"  {'previous page':{menu_width-2}}",
+				*scores_list,
+				f"  {'next page':{menu_width-2}}",
+				f"  {'jump to row':{menu_width-2}}",
+			],
+			title=f"{title} rows {start + 1 if len(view) else 0}-{start + len(scores_list)} of {len(view)}"
+				f" page {page + 1}/{view.pages(height)}\n",
+			cursor_index=scores_index,  # The initially selected item index.
+		**menu_style).show()
+
+		if scores_index is None:
+			break
+
+		if scores_index == 0:
+			page = max(page - 1, 0)
+
+		elif scores_index == len(scores_list) + 1:
+			page = min(page + 1, view.pages(height) - 1)
+			scores_index = 1
+
+		elif scores_index == len(scores_list) + 2:
+			answer = input(f"  row 1-{len(view)}: ").strip()
+			row = min(max(int(answer) - 1 if answer.isdigit() else start, 0), max(len(view) - 1, 0))
+			page = view.page_of(row, height)
+			scores_index = row - page * height + 1
+
+		else:
+			view.marked.add(start + scores_index - 1)
+			preferred_scores.add(sub("^ ", "+", scores_list[scores_index - 1]))  # type: ignore
+
 
 if __name__ == "__main__":
+	TerminalMenu = _terminal_menu()
+	background = Background()
+
+	declarative_games |= definitions()
+	game_dict |= declarative_games
+
 	preferred_scores = set()
 
 	game_index = 0
@@ -114,6 +269,7 @@ if __name__ == "__main__":
 			game = list(game_dict.values())[game_index]
 
 			if game == game_dict["DungeonsDragons"]:
+				DungeonsDragons = load_game("DungeonsDragons")
 				tier = 2
 
 				while tier is not None:
@@ -169,84 +325,141 @@ if __name__ == "__main__":
 							subrace = ""
 
 						extra = 0
+						background.clear()  # a new set-up makes speculative palettes of the previous one useless
 
 						while extra is not None:
+							submit_dungeons_dragons(background, tier, race, subrace, extra)  # prefetch the palettes under the cursor
+
 							extra = TerminalMenu(
-								(f"  +{key:<{menu_width-3}}" for key in range(DungeonsDragons._max_extra + 1)),
+								(
+									f"  {f'+{key}':<{menu_width-2}}"
+									for key in range(DungeonsDragons._max_extra + 1)
+								),
 								title=f"{game}: {DungeonsDragons._names[tier]} {subrace} {race} extra\n",
 								cursor_index=extra,  # type: ignore  # The initially selected item index.
-							**menu_style).show()
+							**menu_style | {
+								"status_bar": lambda entry: status(
+									background.get(("DungeonsDragons", tier, race, subrace, int(entry.split()[0])))),
+							}).show()
 
 							if extra is None:
 								break
 
-							scores_list = [
-								f" {key:<{menu_width-1}}" for key in repr(DungeonsDragons(tier, race, subrace, extra)).split("\n")
-							]
-							scores_index = 0
+							job = submit_dungeons_dragons(background, tier, race, subrace, extra)
 
-							while scores_index is not None:
-								scores_index = TerminalMenu(
-									scores_list,
-									title=f"{game}: {DungeonsDragons._names[tier]} {subrace} {race} +{extra} {len(scores_list)}\n",
-									cursor_index=scores_index,  # type: ignore  # The initially selected item index.
-								**menu_style).show()
+							if extra < DungeonsDragons._max_extra:
+								submit_dungeons_dragons(background, tier, race, subrace, extra + 1)  # prefetch the likely next selection
 
-								if scores_index is None:
-									break
-
-								scores_list[scores_index] = sub("^ ", "+", scores_list[scores_index])  # type: ignore
-								preferred_scores.add(scores_list[scores_index])  # type: ignore
+							browse(f"{game}: {DungeonsDragons._names[tier]} {subrace} {race} +{extra}", background.wait(job, progress), preferred_scores)
 
 			if game == game_dict["Cyberpunk2077"]:
+				Cyberpunk2077 = load_game("Cyberpunk2077")
 				level = 0
+				background.clear()  # palettes of another game are of no use any more
 
 				while level is not None:
+					submit_cyberpunk(background, level + 1)  # prefetch the palettes under the cursor
+
 					level = TerminalMenu(
-						(f"  {f'{key+1:>2}':<{menu_width-2}}" for key in range(Cyberpunk2077._max_level)),
+						(
+							f"  {f'{key+1:>2}':<{menu_width-2}}"
+							for key in range(Cyberpunk2077._max_level)
+						),
 						title=f"{game}: level\n",
 						cursor_index=level,  # type: ignore  # The initially selected item index.
-					**menu_style).show()
+					**menu_style | {
+						"status_bar": lambda entry: status(background.get(("Cyberpunk2077", int(entry.split()[0])))),
+					}).show()
 
 					if level is None:
 						break
 
-					scores_list = [
-						f" {key:<{menu_width-1}}" for key in str(Cyberpunk2077(level + 1)).split("\n")  # type: ignore
-					]
-					scores_index = 0
+					background.retain({("Cyberpunk2077", level + 1 + offset) for offset in (-1, 0, 1)})  # levels far off are unlikely picks
+					job = submit_cyberpunk(background, level + 1)
 
-					while scores_index is not None:
-						scores_index = TerminalMenu(
-							scores_list,
-							title=f"{game}: Level {level+1} ({len(scores_list)})\n",
-							cursor_index=scores_index,  # type: ignore  # The initially selected item index.
-						**menu_style).show()
+					if level + 1 < Cyberpunk2077._max_level:
+						submit_cyberpunk(background, level + 2)  # prefetch the likely next selection
 
-						if scores_index is None:
-							break
-
-						scores_list[scores_index] = sub("^ ", "+", scores_list[scores_index])  # type: ignore
-						preferred_scores.add(scores_list[scores_index])  # type: ignore
+					browse(f"{game}: Level {level+1}", background.wait(job, progress), preferred_scores)
 
 			if game == game_dict["DiscoElysium"]:
-				scores_list = [
-					f" {key:<{menu_width-1}}" for key in str(DiscoElysium()).split("\n")
-				]
-				scores_index = 0
-
-				while scores_index is not None:
-					scores_index = TerminalMenu(
-						scores_list,
-						title=f"{game}: ({len(scores_list)})\n",
-						cursor_index=scores_index,  # type: ignore  # The initially selected item index.
+				DiscoElysium = load_game("DiscoElysium")
+				job = background.submit(("DiscoElysium",), lambda: DiscoElysium(lazy=True, cache=True))
+				browse(f"{game}:", background.wait(job, progress), preferred_scores)
+
+			if game in declarative_games.values():
+				key = list(game_dict)[game_index]
+				definition = import_module("src.games.declarative").compiled(key)
+				tier_index = 0
+
+				while tier_index is not None:
+					tier_index = TerminalMenu(
+						(f"  {value:{menu_width-2}}" for value in definition.tiers),
+						title=f"{game}: tier\n",
+						cursor_index=tier_index,  # type: ignore  # The initially selected item index.
 					**menu_style).show()
 
-					if scores_index is None:
+					if tier_index is None:
 						break
 
-					scores_list[scores_index] = sub("^ ", "+", scores_list[scores_index])  # type: ignore
-					preferred_scores.add(scores_list[scores_index])  # type: ignore
+					tier = list(definition.tiers)[tier_index]  # type: ignore
+					race_index = 0
+
+					while race_index is not None:
+						race_index = TerminalMenu(
+							(f"  {value:{menu_width-2}}" for value in ["-", *definition.races]),
+							title=f"{game}: {tier} race\n",
+							cursor_index=race_index,  # type: ignore  # The initially selected item index.
+						**menu_style).show()
+
+						if race_index is None:
+							break
+
+						race = list(definition.races)[race_index - 1] if race_index else None  # type: ignore
+						subrace = None
+
+						if race is not None and type(definition.races[race]) is dict:
+							subrace_index = TerminalMenu(
+								(f"  {value:{menu_width-2}}" for value in definition.races[race]),
+								title=f"{game}: {tier} subrace {race}\n",
+							**menu_style).show()
+
+							if subrace_index is None:
+								continue
+
+							subrace = list(definition.races[race])[subrace_index]  # type: ignore
+
+						level = 0
+						background.clear()  # a new set-up makes speculative palettes of the previous one useless
+
+						while level is not None:
+							submit_declarative(background, key, tier, race, subrace, definition.min_level + level)  # prefetch the palettes under the cursor
+
+							level = TerminalMenu(
+								(
+									f"  {f'{value:>2}':<{menu_width-2}}"
+									for value in range(definition.min_level, definition.max_level + 1)
+								),
+								title=f"{game}: {tier} {subrace or ''} {race or ''} level\n",
+								cursor_index=level,  # type: ignore  # The initially selected item index.
+							**menu_style | {
+								"status_bar": lambda entry: status(
+									background.get((key, tier, race, subrace, int(entry.split()[0])))),
+							}).show()
+
+							if level is None:
+								break
+
+							job = submit_declarative(background, key, tier, race, subrace, definition.min_level + level)
+
+							if definition.min_level + level < definition.max_level:
+								submit_declarative(background, key, tier, race, subrace, definition.min_level + level + 1)  # prefetch the likely next selection
+
+							browse(
+								f"{game}: {tier} {subrace or ''} {race or ''} level {definition.min_level + level}",
+								background.wait(job, progress),
+								preferred_scores,
+							)
 
 		for scores in sorted(preferred_scores):
 			print(scores)
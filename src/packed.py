@@ -0,0 +1,189 @@
+"""Compact score palettes.
+
+Pack each score palette into a single integer, one byte per score, and store palette sets as plain 64-bit arrays.
+This keeps the largest configurations in memory at 8 bytes per palette instead of a tuple object per palette.
+"""
+
+import bisect
+from array import array
+from typing import Iterable, Iterator
+
+from . import abilities
+from .abilities import Abilities, Scores, augmented
+
+
+class PackedScores(int):
+	"""A score palette packed into an integer with one byte per score.
+
+	A leading sentinel bit marks the extent of the palette, so that zero scores are not lost.
+	Scores are packed first to last from the most significant byte,
+	so that packed palettes of the same extent compare like the score palettes themselves.
+
+	Operators:
+		__add__: add two score palettes element-wise
+		__mod__: count how many scores are divisible by argument
+
+	Methods:
+		distribution: the distribution of given scores across the spectrum
+		pattern: counting of the distribution values
+	"""
+
+	_width = 8
+	_mask = (1 << _width) - 1
+
+	def __new__(cls, scores: Iterable[int] | int):
+		"""Pack a score palette.
+
+		Arguments:
+			scores: a score palette with scores in 0-255, or an already packed palette
+
+		Returns:
+			the packed score palette
+		"""
+		if isinstance(scores, int):
+			return super().__new__(cls, scores)
+
+		packed = 1
+
+		for score in scores:
+			if not 0 <= score <= PackedScores._mask:
+				raise ValueError(f"score {score} does not fit in {PackedScores._width} bits")
+
+			packed = packed << PackedScores._width | score
+
+		return super().__new__(cls, packed)
+
+	def __len__(self) -> int:
+		"""Get the number of scores in the palette."""
+		return (self.bit_length() - 1) // PackedScores._width
+
+	def __iter__(self) -> Iterator[int]:
+		"""Unpack the scores in the palette first to last."""
+		for shift in range(PackedScores._width * (len(self) - 1), -1, -PackedScores._width):
+			yield self >> shift & PackedScores._mask
+
+	def unpack(self) -> Scores:
+		"""Get the score palette as a tuple of scores."""
+		return Scores(self)
+
+	def __repr__(self, spectrum: set[int] | None = None, mod: int = 1) -> str:
+		"""Print one line with scores and statistics exactly like `Scores.__repr__`."""
+		return self.unpack().__repr__(spectrum, mod)
+
+	def __add__(self, other: Iterable[int]) -> "PackedScores":  # type: ignore
+		"""Add two score palettes element-wise.
+
+		Arguments:
+			other: another score palette, packed or not
+
+		Returns:
+			the sorted sum of two score palettes packed
+		"""
+		return PackedScores(sorted(self_score + other_score for self_score, other_score in zip(self, other)))
+
+	def __mod__(self, times: int) -> int:  # type: ignore
+		"""Count how many scores are divisible by times.
+
+		Arguments:
+			times: base of multiples scores are checked against
+
+		Returns:
+			count of scores with zero residual on times
+		"""
+		return sum(1 for score in self if score % times == 0)
+
+	def distribution(self, spectrum: set[int]) -> list[int]:
+		"""Get the distribution of given scores across the spectrum given (see `Scores.distribution`)."""
+		return self.unpack().distribution(spectrum)
+
+	def pattern(self, distribution: list[int]) -> list[int]:
+		"""Get the distribution of given counts across the score distribution given (see `Scores.pattern`)."""
+		return self.unpack().pattern(distribution)
+
+
+class PackedAbilities:
+	"""A sorted set of score palettes stored as an array of packed palettes.
+
+	Palettes are streamed in from an `Abilities` instance, lazy ones included,
+	so the full set of score palette tuples never needs to exist.
+
+	Attributes:
+		_schema: dict with costs of scores
+		_extent: number of attributes in ability score system
+		_cutoff: the cost of viable score palettes
+		_spectrum: scores printed in distributions
+		_mod: base of multiples counted when printing
+		_palettes: sorted array of packed score palettes
+
+	Methods:
+		augment: augment all score palettes with augmentation score palettes
+		iter_palettes: stream all score palettes in ascending order
+
+	Operators:
+		__repr__: print all score palettes like `Abilities.__repr__`
+	"""
+
+	_max_extent = (64 - 1) // PackedScores._width
+
+	def __init__(self, abilities: Abilities):
+		"""Pack the palettes of an attribute score system.
+
+		Arguments:
+			abilities: the attribute score system to pack, preferably lazy
+		"""
+		if abilities._extent > PackedAbilities._max_extent:
+			raise ValueError(f"cannot pack more than {PackedAbilities._max_extent} scores in 64 bits")
+
+		self._schema = abilities._schema
+		self._extent = abilities._extent
+		self._cutoff = abilities._cutoff
+		self._spectrum = abilities._spectrum if abilities._spectrum is not None else set(abilities._schema)
+		self._mod = abilities._mod
+		self._palettes = array("Q", map(PackedScores, abilities.iter_palettes()))
+
+	def __len__(self) -> int:
+		"""Get the number of score palettes."""
+		return len(self._palettes)
+
+	def __iter__(self) -> Iterator[PackedScores]:
+		"""Iterate over packed score palettes in ascending order."""
+		return map(PackedScores, self._palettes)
+
+	def __contains__(self, scores: Iterable[int]) -> bool:
+		"""Check whether a score palette is in the set by bisection.
+
+		Arguments:
+			scores: a score palette, packed or not, in ascending order
+
+		Returns:
+			whether the score palette is in the set
+		"""
+		try:
+			packed = PackedScores(scores)
+
+		except ValueError:
+			return False
+
+		index = bisect.bisect_left(self._palettes, packed)
+
+		return index < len(self._palettes) and self._palettes[index] == packed
+
+	def augment(self, augmentations: set[tuple[int, ...]]):
+		"""Augment all score palettes with each augmentation (see `Abilities.augment`).
+
+		The augmented palettes are streamed sorted and deduplicated straight into the new array (see `abilities.augmented`),
+		so only the window of pending results exists as score palette tuples at any time.
+
+		Arguments:
+			augmentations: a score palette containing the ne augmentation to mixin
+		"""
+		self._palettes = array("Q", map(PackedScores, augmented(self.iter_palettes(), augmentations)))
+
+	def iter_palettes(self) -> Iterator[Scores]:
+		"""Stream all score palettes in ascending order unpacked."""
+		for packed in self:
+			yield packed.unpack()
+
+	def __repr__(self, spectrum: set[int] | None = None, mod: int | None = None) -> str:
+		"""Print score palettes along with their various statistics exactly like `Abilities.__repr__`."""
+		return "\n".join(abilities.render(self.iter_palettes(), self._spectrum if spectrum is None else spectrum, self._mod if mod is None else mod))
@@ -0,0 +1,159 @@
+"""Score palette queries.
+
+Filter the score palettes of an attribute score system by constraints on their statistics,
+like at least two scores of 16 or more, a sum of 78 or more, six even scores or a specific pattern:
+
+	index = Index(DungeonsDragons(2, "Human", "Standard", 4))
+	index.select(at_least=[(2, 16)], sum=(78, None), mod=6)
+
+Statistics are computed once per palette, and each is indexed on first use
+by a sorted list of its distinct values along with a bitmap of the palettes having each value.
+Constraints then combine by bitwise operations on the bitmaps, instead of a rescan of all palettes.
+"""
+
+from typing import Iterator
+
+from . import abilities
+from .abilities import Abilities, Scores
+from .export import statistics
+
+Constraint = int | tuple[int | None, int | None] | None
+
+
+class Index:
+	"""Bitmap indexes over the statistics of score palettes.
+
+	Bitmaps are plain integers with bit i set for the i-th palette in ascending order.
+
+	Attributes:
+		_palettes: all score palettes in ascending order
+		_spectrum: scores printed in distributions
+		_mod: base of multiples counted
+		_columns: each statistic of each palette, by statistic name
+		_bitmaps: sorted distinct values and a bitmap for each, by indexed statistic name
+
+	Methods:
+		bitmap: the palettes satisfying all constraints given as a bitmap
+		select: the palettes satisfying all constraints given
+		count: the number of palettes satisfying all constraints given
+		lines: the printed palettes satisfying all constraints given
+	"""
+
+	def __init__(self, abilities: Abilities, spectrum: set[int] | None = None, mod: int | None = None):
+		"""Compute the statistics of all palettes of an attribute score system.
+
+		Arguments:
+			abilities: the attribute score system to query
+			spectrum: a set of possible scores for printing distributions
+				default: the spectrum of the attribute score system, or else the scores in the schema
+			mod: base of multiples scores are checked against
+				default: the mod of the attribute score system
+		"""
+		self._palettes = list(abilities.iter_palettes())
+		self._spectrum = sorted(spectrum if spectrum is not None else
+			abilities._spectrum if abilities._spectrum is not None else abilities._schema)
+		self._mod = abilities._mod if mod is None else mod
+		self._columns: dict[str, list] = {"sum": [], "mod": [], "type": [], "pattern": []}
+
+		for scores in self._palettes:
+			total, modded, _type, pattern, _ = statistics(scores, self._spectrum, self._mod)
+			self._columns["sum"].append(total)
+			self._columns["mod"].append(modded)
+			self._columns["type"].append(_type)
+			self._columns["pattern"].append(tuple(pattern))
+
+		self._bitmaps: dict[str, tuple[list, dict]] = {}
+
+	def __len__(self) -> int:
+		"""Get the number of score palettes indexed."""
+		return len(self._palettes)
+
+	def _index(self, name: str) -> tuple[list, dict]:
+		"""Get the sorted distinct values of a statistic and the bitmap of each, building them on first use."""
+		if name not in self._bitmaps:
+			if name not in self._columns:  # the count of scores at or above a threshold, as in "at least"
+				threshold = int(name.removeprefix("above"))
+				self._columns[name] = [sum(1 for score in scores if score >= threshold) for scores in self._palettes]
+
+			bits: dict = {}
+			size = (len(self._palettes) + 7) // 8
+
+			for position, value in enumerate(self._columns[name]):
+				if value not in bits:
+					bits[value] = bytearray(size)
+
+				bits[value][position >> 3] |= 1 << (position & 7)
+
+			self._bitmaps[name] = (
+				sorted(bits),
+				{value: int.from_bytes(_bits, "little") for value, _bits in bits.items()},
+			)
+
+		return self._bitmaps[name]
+
+	def _match(self, name: str, constraint: Constraint) -> int:
+		"""Get the bitmap of palettes whose statistic equals a value, or lies within an inclusive range open on None ends."""
+		values, bitmaps = self._index(name)
+
+		if not isinstance(constraint, tuple) or name == "pattern":
+			return bitmaps.get(constraint, 0)
+
+		low, high = constraint
+		bitmap = 0
+
+		for value in values:
+			if (low is None or value >= low) and (high is None or value <= high):
+				bitmap |= bitmaps[value]
+
+		return bitmap
+
+	def bitmap(self,
+		at_least: list[tuple[int, int]] | None = None,
+		sum: Constraint = None,
+		mod: Constraint = None,
+		type: Constraint = None,
+		pattern: tuple[int, ...] | None = None,
+	) -> int:
+		"""Get the palettes satisfying all constraints given as a bitmap.
+
+		Arguments:
+			at_least: pairs of a count and a score, each requiring at least count scores at or above score
+			sum: the sum of scores, exactly or as a (low, high) inclusive range, either end open on None
+			mod: the count of scores divisible by the mod, exactly or as a range
+			type: the number of distinct scores, exactly or as a range
+			pattern: the exact pattern of score multiplicities (see `Scores.pattern`)
+
+		Returns:
+			a bitmap with bit i set for each satisfying i-th palette
+		"""
+		bitmap = (1 << len(self._palettes)) - 1
+
+		for count, score in at_least or ():
+			bitmap &= self._match(f"above{score}", (count, None))
+
+		for name, constraint in (("sum", sum), ("mod", mod), ("type", type), ("pattern", pattern)):
+			if constraint is not None:
+				bitmap &= self._match(name, tuple(constraint) if name == "pattern" else constraint)  # type: ignore
+
+		return bitmap
+
+	def _positions(self, bitmap: int) -> Iterator[int]:
+		"""Yield the positions of the bits set in a bitmap in ascending order."""
+		for offset, byte in enumerate(bitmap.to_bytes((len(self._palettes) + 7) // 8, "little")):
+			while byte:
+				low = byte & -byte
+				yield offset << 3 | low.bit_length() - 1
+				byte ^= low
+
+	def select(self, **constraints) -> Iterator[Scores]:
+		"""Yield the palettes satisfying all constraints given (see `bitmap`) in ascending order."""
+		for position in self._positions(self.bitmap(**constraints)):
+			yield self._palettes[position]
+
+	def count(self, **constraints) -> int:
+		"""Count the palettes satisfying all constraints given (see `bitmap`)."""
+		return self.bitmap(**constraints).bit_count()
+
+	def lines(self, **constraints) -> Iterator[str]:
+		"""Stream the printed palettes satisfying all constraints given (see `bitmap` and `render`)."""
+		yield from abilities.render(self.select(**constraints), self._spectrum, self._mod)
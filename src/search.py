@@ -0,0 +1,240 @@
+"""Best score palette search.
+
+Find the palettes of an attribute score system that score best by a function of the palette,
+like the sum of the best two D&D modifiers, without enumerating them all:
+
+	top(DungeonsDragons(2, "Elf", "High", 4, lazy=True), lambda scores: sum((score - 10) // 2 for score in scores[-2:]), monotone=True)
+
+The search is best-first branch and bound over the tree of score combinations that `abilities.combinations` walks,
+and then over the bonus vectors of each base palette, grouped by their shape, that is their bonuses in ascending order.
+Adding any bonus vector of a shape to a palette gives a palette between two bounding palettes, score by score,
+pairing scores with bonuses like Weyl's inequalities do, so a whole shape is bounded without adding any of its vectors.
+Each branch is bounded through the best palette it could still reach,
+its remaining scores all at the highest score the `Schema` costs leave affordable, bounded by each shape in turn.
+For scoring functions that never decrease when a score increases, these bounds are never beaten,
+so branches and shapes that cannot beat the palettes found are pruned, and the search stops when no branch is left.
+Such functions are to be declared monotone, since the bounds are wrong for any other function, like a count of even scores.
+Other functions can still be pruned by a bound of their own on the branches, given along with them.
+Palettes tied with the k-th best one are pruned by their lowest reachable palette, as smaller palettes win ties,
+but only once a bound comes down to their score, so functions scoring most palettes alike, like the sum of all scores,
+are best given their exact bound, or else the search costs about as much as evaluating all palettes.
+"""
+
+import functools
+import heapq
+import itertools
+import math
+import operator
+from typing import Callable, Collection
+
+from .abilities import Abilities, Scores
+from .augmentations import canonical
+
+
+def ceiling(palette: tuple[int, ...], shape: tuple[int, ...]) -> tuple[int, ...]:
+	"""Bound the palettes a palette gives with any bonus vector of a shape from above, score by score.
+
+	Arguments:
+		palette: scores in ascending order
+		shape: bonuses in ascending order
+
+	Returns:
+		each score of the augmented palettes in ascending order at its highest
+	"""
+	extent = len(palette)
+
+	return tuple(min(palette[index] + shape[rank + extent - 1 - index] for index in range(rank, extent)) for rank in range(extent))
+
+
+def floor(palette: tuple[int, ...], shape: tuple[int, ...]) -> tuple[int, ...]:
+	"""Bound the palettes a palette gives with any bonus vector of a shape from below, score by score.
+
+	Arguments:
+		palette: scores in ascending order
+		shape: bonuses in ascending order
+
+	Returns:
+		each score of the augmented palettes in ascending order at its lowest
+	"""
+	return tuple(max(palette[index] + shape[rank - index] for index in range(rank + 1)) for rank in range(len(palette)))
+
+
+def top(
+	abilities: Abilities,
+	score: Callable[[Scores], float],
+	k: int = 10,
+	monotone: bool = False,
+	bound: Callable[[tuple[int, ...], int, int], float] | None = None,
+) -> list[tuple[float, Scores]]:
+	"""Find the best scoring palettes of an attribute score system.
+
+	Lazy palettes are searched for from the schema and the pending augmentations, as long as branches can be bounded.
+	Stored palettes, or palettes scored by a function neither monotone nor given a bound, are ranked in one pass instead.
+
+	Arguments:
+		abilities: the attribute score system to search
+		score: the function to maximise over palettes
+		k: how many palettes to find
+			default: 10
+		monotone: whether the function never decreases when a score increases, allowing to prune branches by it
+			default: make no assumption about the function
+		bound: an upper bound on the score of any palette a branch can still reach, never below it,
+			given the base scores picked so far in ascending order, how many are left to pick and the cost left to spend
+			default: bound branches only for monotone functions
+
+	Returns:
+		up to k pairs of a score and a palette, best first and in ascending palette order among equal scores
+	"""
+	if k <= 0:
+		return []
+
+	if not abilities._lazy or not monotone and bound is None:
+		return [
+			(-negative, scores) for negative, scores in
+			heapq.nsmallest(k, ((-score(scores), scores) for scores in abilities.iter_palettes()))
+		]
+
+	schema, extent, cutoff = dict(sorted(abilities._schema.items())), abilities._extent, abilities._cutoff
+	scores = list(schema)
+	costs = [schema[score] for score in scores]
+	cheapest = list(itertools.accumulate(reversed(costs), min))[::-1]  # the cheapest score cost from each score on
+
+	stages: list[dict[tuple[int, ...], Callable[[tuple[int, ...]], Collection[tuple[int, ...]]]]] = []
+
+	for augmentations in abilities._stages:
+		shapes: dict[tuple[int, ...], set[tuple[int, ...]]] = {}
+
+		for augmentation in augmentations:
+			shapes.setdefault(tuple(sorted(augmentation)), set()).add(augmentation)
+
+		stages.append({shape: canonical(frozenset(vectors)) for shape, vectors in shapes.items()})
+
+	highest_shapes = [tuple(map(max, zip(*stage))) for stage in stages]  # the highest bonus of each rank in each stage
+	lowest_shapes = [tuple(map(min, zip(*stage))) for stage in stages]  # the lowest bonus of each rank in each stage
+
+	@functools.cache
+	def feasible(slots: int, budget: int, start: int) -> bool:
+		if not slots:
+			return not budget
+
+		if start == len(scores):
+			return False
+
+		return feasible(slots - 1, budget - costs[start], start) or feasible(slots, budget, start + 1)
+
+	def reach(palette: tuple[int, ...], stage: int) -> float:
+		"""Bound the score of the palettes a palette gives through the stages left, by each shape of each stage in turn."""
+		if stage == len(stages):
+			return score(Scores(palette))
+
+		return max(reach(ceiling(palette, shape), stage + 1) for shape in stages[stage])
+
+	optimistic_reach = functools.cache(reach)  # branches reaching the same best palette share its bound
+
+	def loose(palette: tuple[int, ...], stage: int) -> float:
+		"""Bound the score of the palettes a palette gives through the stages left, by the highest bonus of each rank."""
+		for shape in highest_shapes[stage:]:
+			palette = ceiling(palette, shape)
+
+		return score(Scores(palette))
+
+	def lowest(palette: tuple[int, ...], stage: int) -> tuple[int, ...]:
+		"""Bound the palettes a palette gives through the stages left from below, by the lowest bonus of each rank."""
+		for shape in lowest_shapes[stage:]:
+			palette = floor(palette, shape)
+
+		return palette
+
+	best: list[tuple[float, tuple[int, ...], Scores]] = []  # a min-heap of the best palettes found, keyed in reverse on ties
+	kept: set[Scores] = set()  # the palettes in the heap, to keep palettes reached twice out of it
+
+	def beaten(limit: float, palette: tuple[int, ...]) -> bool:
+		"""Tell whether no palette scoring at most the limit and not below the palette can be among the best."""
+		return len(best) == k and (limit < best[0][0] or limit == best[0][0] and palette >= best[0][2])
+
+	def limit(prefix: tuple[int, ...], slots: int, budget: int, start: int) -> float:
+		given = bound(prefix, slots, budget) if bound is not None else math.inf
+
+		if not monotone or len(best) == k and given < best[0][0]:
+			return given
+
+		affordable = budget - (slots - 1) * cheapest[start] if slots else budget
+		highest = max((scores[index] for index in range(start, len(scores)) if costs[index] <= affordable), default=0)
+		optimistic = tuple(sorted(prefix + (highest,) * slots))
+		_loose = loose(optimistic, 0)
+
+		return min(given, _loose if len(best) == k and _loose < best[0][0] else optimistic_reach(optimistic, 0))
+
+	def keep(palette: Scores):
+		value = score(palette)
+
+		if len(best) == k and (value < best[0][0] or value == best[0][0] and palette >= best[0][2]) or palette in kept:
+			return
+
+		item = (value, tuple(map(operator.neg, palette)), palette)  # smaller palettes win ties
+
+		if len(best) < k:
+			heapq.heappush(best, item)
+
+		else:
+			kept.remove(heapq.heapreplace(best, item)[2])
+
+		kept.add(palette)
+
+	def expand(palette: Scores, given: float, stage: int):
+		"""Augment a palette through the stages left, one shape at a time, the most promising shapes first."""
+		if stage == len(stages):
+			keep(palette)
+			return
+
+		shapes = sorted(
+			(
+				-min(given, reach(ceiling(palette, shape), stage + 1) if monotone else given),
+				lowest(floor(palette, shape), stage + 1),
+				shape,
+			)
+			for shape in stages[stage]
+		)
+
+		for negative_limit, _lowest, shape in shapes:
+			if beaten(-negative_limit, _lowest):
+				continue
+
+			bonuses = stages[stage][shape](palette)
+
+			if stage + 1 < len(stages):
+				for bonus in bonuses:
+					expand(palette + bonus, given, stage + 1)
+
+			else:
+				for bonus in bonuses:
+					keep(Scores(sorted(map(operator.add, palette, bonus))))  # the last stage is added in place, being the bulk of the work
+
+	branches = [(-limit((), extent, cutoff, 0), (), extent, cutoff, 0)] if extent and feasible(extent, cutoff, 0) else []
+
+	while branches:
+		negative_limit, prefix, slots, budget, start = heapq.heappop(branches)
+
+		if len(best) == k and -negative_limit < best[0][0]:
+			break
+
+		if beaten(-negative_limit, lowest(prefix + (scores[start],) * slots, 0)):
+			continue
+
+		for index in range(start, len(scores)):
+			if not feasible(slots - 1, budget - costs[index], index):
+				continue
+
+			branch = (prefix + (scores[index],), slots - 1, budget - costs[index], index)
+			_limit = limit(*branch)
+
+			if beaten(_limit, lowest(branch[0] + (scores[index],) * branch[1], 0)):
+				continue
+
+			if slots > 1:
+				heapq.heappush(branches, (-_limit, *branch))
+
+			else:
+				expand(Scores(branch[0]), bound(*branch[:3]) if bound is not None else math.inf, 0)  # base palettes are augmented right away
+
+	return [(value, palette) for value, _, palette in sorted(best, reverse=True)]
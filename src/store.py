@@ -0,0 +1,326 @@
+"""Shared memory score palette store.
+
+Publish the score palettes of popular configurations once, along with their statistics,
+in shared memory blocks named after their cache keys (see `Abilities._key`),
+so that any process attaches to them without recomputing, reading or unpickling anything:
+
+	store = Store()
+	segment = store.get(DungeonsDragons(2, "Human", "Standard", lazy=True))  # published by the first process asking
+	segment.array()["sum"].max()
+
+Lazy attribute score systems know their cache key without evaluating any palette,
+so attaching costs no more than opening the block. Only a missing block is evaluated and published,
+by the first process claiming its name, while the others wait for it.
+
+Each block holds a small header with the extent, count, mod and spectrum of the palettes,
+followed by one row per palette in ascending order, laid out like the rows of `.npy` exports (see `export._dtype`):
+the scores, sum, mod count, type, pattern and distribution as signed 16-bit integers.
+The header is written last, so a block still being published is never attached to.
+
+Blocks outlive the processes using them, until unlinked from the store.
+"""
+
+import struct
+import sys
+import time
+from array import array
+from multiprocessing import resource_tracker, shared_memory
+from typing import Iterator
+
+from .abilities import Abilities, Scores, _numpy
+from .export import _dtype, statistics
+
+
+def _untrack(memory: shared_memory.SharedMemory):
+	"""Keep a shared memory block alive after the process using it exits, until it is unlinked from the store."""
+	if sys.version_info < (3, 13):  # later versions are asked not to track blocks in the first place
+		resource_tracker.unregister(memory._name, "shared_memory")  # type: ignore
+
+
+class Segment:
+	"""Score palettes with their statistics in a shared memory block, read in place.
+
+	Attributes:
+		extent: number of attributes in ability score system
+		count: number of score palettes
+		mod: base of multiples counted
+		spectrum: scores counted in distributions
+		_memory: the shared memory block
+		_rows: the block past its header, as signed 16-bit integers
+
+	Methods:
+		row: the scores and statistics of a palette
+		palettes: iterate over the score palettes
+		array: the rows as a structured array
+		close: detach from the block
+	"""
+
+	_header = struct.Struct("<4sIIhH")
+	_magic = b"ABS1"
+
+	def __init__(self, memory: shared_memory.SharedMemory):
+		"""Read the header of a published block.
+
+		Arguments:
+			memory: the shared memory block
+
+		Raises:
+			ValueError: when the block is not a published palette block, or is still being published
+		"""
+		magic, self.extent, self.count, self.mod, length = Segment._header.unpack_from(memory.buf)
+
+		if magic != Segment._magic:
+			raise ValueError(f"shared memory block {memory.name!r} holds no published score palettes")
+
+		offset = Segment._header.size + 2 * length
+
+		self.spectrum = list(memory.buf[Segment._header.size:offset].cast("h"))
+		self._memory = memory
+		self._rows = memory.buf[offset:offset + 2 * self.count * self.width].cast("h")
+
+	@property
+	def width(self) -> int:
+		"""Get the number of integers in each row."""
+		return 2 * self.extent + 3 + len(self.spectrum)
+
+	def __len__(self) -> int:
+		"""Get the number of score palettes."""
+		return self.count
+
+	def row(self, index: int) -> tuple[Scores, int, int, int, list[int], list[int]]:
+		"""Get the scores and statistics of a palette.
+
+		Arguments:
+			index: the position of the palette in ascending order
+
+		Returns:
+			the score palette, its sum, mod count, type, pattern and distribution (see `export.statistics`)
+		"""
+		row = self._rows[index * self.width:(index + 1) * self.width].tolist()
+
+		return (
+			Scores(row[:self.extent]),
+			*row[self.extent:self.extent + 3],
+			row[self.extent + 3:2 * self.extent + 3],
+			row[2 * self.extent + 3:],
+		)  # type: ignore
+
+	def palettes(self) -> Iterator[Scores]:
+		"""Iterate over the score palettes in ascending order, unpacking them in chunks."""
+		for start in range(0, self.count, 1 << 16):
+			rows = self._rows[start * self.width:min(start + (1 << 16), self.count) * self.width].tolist()
+
+			yield from (Scores(rows[index:index + self.extent]) for index in range(0, len(rows), self.width))
+
+	def array(self):
+		"""Get the rows as a structured array over the block itself, like a loaded `.npy` export (see `export.load`).
+
+		The array has to be released before the segment is closed.
+
+		Returns:
+			a read-only structured array with a row per palette
+		"""
+		numpy = _numpy()
+
+		if numpy is None:
+			raise ImportError("structured arrays require numpy to be installed")
+
+		rows = numpy.frombuffer(self._rows, dtype=_dtype(self.extent, self.spectrum), count=self.count)
+		rows.flags.writeable = False
+
+		return rows
+
+	def close(self):
+		"""Detach from the block, leaving it published for other processes."""
+		self._rows.release()
+		self._memory.close()
+
+	def __del__(self):
+		"""Detach from the block before it is closed along with the process."""
+		try:
+			self.close()
+
+		except BufferError:  # arrays over the block are still alive, and close it when they go
+			pass
+
+		except AttributeError:  # the block held no published palettes, and was closed right away
+			pass
+
+
+class Store:
+	"""Shared memory blocks of score palettes by cache key.
+
+	Attributes:
+		_prefix: the prefix of the block names, to keep stores apart
+		_segments: the segments attached to by this process, by cache key
+		_poll: seconds between attempts to attach to a block another process is publishing
+
+	Methods:
+		publish: evaluate score palettes into a new block
+		attach: attach to the block of a cache key
+		get: attach to the block of an attribute score system, publishing it first if missing
+		unlink: remove the block of a cache key
+	"""
+
+	_poll = 0.05
+
+	def __init__(self, prefix: str = "abl"):
+		"""Prepare a store, attaching to no block yet.
+
+		Arguments:
+			prefix: the prefix of the block names, short since some systems limit names to 31 characters
+				default: "abl"
+		"""
+		self._prefix = prefix
+		self._segments: dict[str, Segment] = {}
+
+	def _name(self, key: str) -> str:
+		"""Name the block of a cache key."""
+		return f"{self._prefix}{key[:24]}"
+
+	def publish(self, abilities: Abilities) -> Segment:
+		"""Evaluate the score palettes of an attribute score system with their statistics into a new block.
+
+		Arguments:
+			abilities: the attribute score system to publish, lazy ones streamed once
+
+		Returns:
+			the published segment, attached to
+
+		Raises:
+			FileExistsError: when the block is already published or being published
+		"""
+		spectrum = sorted(abilities._spectrum if abilities._spectrum is not None else abilities._schema)
+		rows = array("h")
+		count = 0
+
+		for scores in abilities.iter_palettes():
+			total, modded, _type, pattern, distribution = statistics(scores, spectrum, abilities._mod)
+			rows.extend((*scores, total, modded, _type, *pattern, *distribution))
+			count += 1
+
+		offset = Segment._header.size + 2 * len(spectrum)
+		memory = shared_memory.SharedMemory(
+			self._name(abilities._key), create=True, size=max(1, offset + rows.itemsize * len(rows)),
+			**({"track": False} if sys.version_info >= (3, 13) else {}),
+		)
+		_untrack(memory)
+
+		memory.buf[Segment._header.size:offset] = array("h", spectrum).tobytes()
+		memory.buf[offset:offset + rows.itemsize * len(rows)] = rows.tobytes()
+		Segment._header.pack_into(memory.buf, 0, Segment._magic, abilities._extent, count, abilities._mod, len(spectrum))
+
+		self._segments[abilities._key] = Segment(memory)
+
+		return self._segments[abilities._key]
+
+	def attach(self, key: str) -> Segment | None:
+		"""Attach to the block of a cache key, once per process.
+
+		Arguments:
+			key: the cache key of the score palettes (see `Abilities._key`)
+
+		Returns:
+			the published segment, or nothing if there is no block yet or it is still being published
+		"""
+		if key in self._segments:
+			return self._segments[key]
+
+		try:
+			memory = shared_memory.SharedMemory(self._name(key), **({"track": False} if sys.version_info >= (3, 13) else {}))
+
+		except FileNotFoundError:
+			return None
+
+		_untrack(memory)
+
+		try:
+			self._segments[key] = Segment(memory)
+
+		except (ValueError, struct.error):
+			memory.close()
+			return None
+
+		return self._segments[key]
+
+	def _claim(self, key: str) -> shared_memory.SharedMemory | None:
+		"""Claim the publication of the block of a cache key with a small sentinel block, created once.
+
+		The sentinel stays tracked, so that it is removed along with a process dying while publishing.
+
+		Arguments:
+			key: the cache key of the score palettes (see `Abilities._key`)
+
+		Returns:
+			the sentinel block, to unlink once published, or nothing if another process claimed it first
+		"""
+		try:
+			return shared_memory.SharedMemory(f"{self._name(key)}~", create=True, size=1)
+
+		except FileExistsError:
+			return None
+
+	def get(self, abilities: Abilities, timeout: float | None = None) -> Segment | None:
+		"""Attach to the block of an attribute score system, evaluating and publishing it first if there is none.
+
+		The first process to claim a missing block publishes it, the others wait for it and attach,
+		so that no palettes are evaluated twice.
+
+		Arguments:
+			abilities: the attribute score system, best lazy so that attaching evaluates nothing
+			timeout: seconds to wait for another process publishing the block
+				default: wait until it is published
+
+		Returns:
+			the published segment, or nothing if another process is still publishing it after the timeout
+		"""
+		deadline = None if timeout is None else time.monotonic() + timeout
+
+		while True:
+			segment = self.attach(abilities._key)
+
+			if segment is not None:
+				return segment
+
+			claim = self._claim(abilities._key)
+
+			if claim is not None:
+				try:
+					segment = self.attach(abilities._key)  # published by the previous claimant since
+
+					return segment if segment is not None else self.publish(abilities)
+
+				except FileExistsError:  # published without claiming it first
+					continue
+
+				finally:
+					claim.close()
+					claim.unlink()
+
+			if deadline is not None and time.monotonic() >= deadline:
+				return None
+
+			time.sleep(Store._poll)
+
+	def unlink(self, key: str):
+		"""Remove the block of a cache key, once no process needs it any more.
+
+		Processes still attached keep reading it until they close it.
+
+		Arguments:
+			key: the cache key of the score palettes (see `Abilities._key`)
+		"""
+		segment = self._segments.pop(key, None)
+
+		try:
+			memory = shared_memory.SharedMemory(self._name(key))
+
+		except FileNotFoundError:
+			memory = None
+
+		if memory is not None:
+			memory.close()
+			memory.unlink()  # also stops the tracking started by opening it above
+
+		if segment is not None:
+			segment.close()
@@ -0,0 +1,105 @@
+"""Virtual score palette list.
+
+Keep the printable score palettes of an attribute score system as they are,
+and print only the rows asked for, like the page of a menu on screen:
+
+	view = View(DungeonsDragons(2, "Human", "Standard", 4))
+	view.load()
+	print("\n".join(view.page(view.page_of(100, 20), 20)))
+"""
+
+from typing import Iterator
+
+from . import abilities
+from .abilities import Abilities, Scores
+
+
+class View:
+	"""A virtual list of printed score palettes, printing rows only on demand.
+
+	Attributes:
+		_abilities: the attribute score system viewed
+		_spectrum: scores printed in distributions, also the ones a palette maximum must be in to be listed
+		_mod: base of multiples counted when printing
+		_palettes: the listed score palettes in ascending order, growing while loading
+		marked: rows marked as favourites
+
+	Methods:
+		load: collect the listed score palettes
+		rows: print a range of rows
+		pages: the number of pages
+		page: print a page of rows
+		page_of: the page a row is in
+	"""
+
+	def __init__(self, abilities: Abilities, spectrum: set[int] | None = None, mod: int | None = None):
+		"""Prepare a view of an attribute score system, with no palettes loaded yet.
+
+		Arguments:
+			abilities: the attribute score system to view
+			spectrum: a set of possible scores for the distribution
+				default: the spectrum of the attribute score system, or else the scores in the schema
+			mod: base of multiples scores are checked against
+				default: the mod of the attribute score system
+		"""
+		self._abilities = abilities
+		self._spectrum = sorted(spectrum if spectrum is not None else
+			abilities._spectrum if abilities._spectrum is not None else abilities._schema)
+		self._mod = abilities._mod if mod is None else mod
+		self._palettes: list[Scores] = []
+
+		self.marked: set[int] = set()
+
+	def __len__(self) -> int:
+		"""Get the number of rows loaded."""
+		return len(self._palettes)
+
+	def load(self):
+		"""Collect the score palettes whose maximum score is in the spectrum, like printing does, without printing them.
+
+		The palettes are appended one by one, so the rows loaded can be counted while loading.
+		"""
+		inside = set(self._spectrum)
+
+		self._palettes.extend(scores for scores in self._abilities.iter_palettes() if max(scores) in inside)
+
+	def rows(self, start: int, stop: int) -> Iterator[str]:
+		"""Print a range of rows exactly like `Abilities.__repr__` prints them.
+
+		Arguments:
+			start: the first row
+			stop: the row after the last one
+
+		Yields:
+			one line per score palette in range
+		"""
+		yield from abilities.render(self._palettes[start:stop], self._spectrum, self._mod)
+
+	def pages(self, height: int) -> int:
+		"""Get the number of pages, at least one even when there are no rows.
+
+		Arguments:
+			height: the number of rows on a page
+		"""
+		return max(1, -(-len(self) // height))
+
+	def page(self, number: int, height: int) -> Iterator[str]:
+		"""Print a page of rows.
+
+		Arguments:
+			number: the page, counting from 0
+			height: the number of rows on a page
+
+		Yields:
+			one line per score palette on the page
+		"""
+		yield from self.rows(number * height, (number + 1) * height)
+
+	def page_of(self, row: int, height: int) -> int:
+		"""Get the page a row is in, clamping the row to the rows there are.
+
+		Arguments:
+			row: the row, counting from 0
+			height: the number of rows on a page
+		"""
+		return min(max(row, 0), len(self) - 1) // height if len(self) else 0